@@ -8,147 +8,255 @@ CLI:
     python3 debug_prep.py prep-setup FILE [--debugger pudb|pdbpp]
 """
 import re
-import ast
+import bisect
+import json
 import os
 import sys
-import argparse
+import types
+
+# Compiled once at import; the bound method skips re's per-call cache lookup
+_ALARM_SUB = re.compile(r'signal\.alarm\([^)]*\)').sub
+
+
+def _is_timeout(line):
+    """True for an @timeout decorator line: '@timeout' after indentation, at a word boundary."""
+    if '@timeout' not in line:  # cheap reject for almost every line, before lstrip copies it
+        return False
+    s = line.lstrip()
+    if not s.startswith('@timeout'):
+        return False
+    return len(s) == 8 or not (s[8].isalnum() or s[8] == '_')
 
 
 def remove_timeouts(lines):
     """Remove all @timeout decorator lines (with or without arguments)."""
-    return [l for l in lines if not re.match(r'\s*@timeout\b', l)]
+    return [l for l in lines if not _is_timeout(l)]
 
 
 def neutralize_alarms(lines):
     """Replace signal.alarm(anything) with signal.alarm(0)."""
-    return [re.sub(r'signal\.alarm\([^)]*\)', 'signal.alarm(0)', l) for l in lines]
+    return [_ALARM_SUB('signal.alarm(0)', l) if 'signal.alarm' in l else l for l in lines]
+
+
+def _clean_lines(lines):
+    """remove_timeouts + neutralize_alarms in one pass.
+
+    Returns (cleaned, to_cleaned) where to_cleaned maps a 1-based line number
+    in lines to its line number in cleaned, so an AST of the original source
+    can be used to index into cleaned.
+    """
+    cleaned = []
+    append = cleaned.append
+    removed_idx = []
+    for i, l in enumerate(lines):
+        if _is_timeout(l):
+            removed_idx.append(i)
+            continue
+        append(_ALARM_SUB('signal.alarm(0)', l) if 'signal.alarm' in l else l)
+
+    def to_cleaned(lineno):
+        return lineno - bisect.bisect_left(removed_idx, lineno - 1) if lineno > 0 else 0
+
+    return cleaned, to_cleaned
+
+
+def _parse(source, filename='<unknown>'):
+    """ast.parse used throughout: no type comments, and SyntaxErrors name the file."""
+    import ast
+    return ast.parse(source, filename=filename, mode='exec', type_comments=False)
+
+
+def _find_funcs(tree, names):
+    """Find (async) defs by name, returning {name: node} for the first match of each.
+
+    Same breadth-first order as ast.walk, so classes nested in if/try blocks or
+    other classes are still searched, but only statement nodes are expanded;
+    expressions, which are most of a file's nodes, are never visited.
+    """
+    import ast
+    kinds = (ast.stmt, ast.excepthandler, ast.match_case)
+    found = {}
+    queue = [tree]
+    for node in queue:  # grows while iterating
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name in names:
+            found.setdefault(node.name, node)
+            if len(found) == len(names):
+                break
+        queue.extend(child for child in ast.iter_child_nodes(node) if isinstance(child, kinds))
+    return found
+
+
+def _find_func(tree, name):
+    """Find a single (async) def by name (see _find_funcs)."""
+    return _find_funcs(tree, {name}).get(name)
+
+
+def _read_lines(path):
+    """Read a file in one call and split it like readlines() would."""
+    with open(path) as f:
+        return _split_lines(f.read())
+
+
+def _split_lines(text):
+    """Split text into lines with line endings, like readlines().
+
+    str.splitlines() also breaks on \\f, \\v, \\x1c etc., which would shift
+    line numbers relative to the AST, so split on '\\n' only.
+    """
+    lines = [l + '\n' for l in text.split('\n')]
+    # Last piece is '' when the file ends with a newline, else a partial line
+    last = lines.pop()
+    if last != '\n':
+        lines.append(last[:-1])
+    return lines
 
 
 MANUAL_BP_FILE = '_pretty_testing_/.manual_breakpoints'
 
 
+# abspath -> ((st_ino, st_mtime_ns, st_size), breakpoints)
+_manual_bp_cache = {}
+
+
 def read_manual_breakpoints():
-    """Read manual breakpoints from file. Returns list of (filepath, line) tuples."""
-    if not os.path.exists(MANUAL_BP_FILE):
+    """Read manual breakpoints from file. Returns list of (filepath, line) tuples.
+
+    The parsed list is cached per file and reused until the file changes.
+    """
+    path = os.path.abspath(MANUAL_BP_FILE)
+    try:
+        st = os.stat(path)
+    except OSError:
         return []
-    breakpoints = []
-    with open(MANUAL_BP_FILE) as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            # Format: filepath:line
-            if ':' in line:
-                parts = line.rsplit(':', 1)
-                if len(parts) == 2:
-                    filepath, lineno = parts
-                    try:
-                        breakpoints.append((filepath, int(lineno)))
-                    except ValueError:
-                        pass
-    return breakpoints
-
-
-def _error_summary_print():
-    """Return code that prints the error summary file if it exists."""
-    return "import os as _os; _es='_pretty_testing_/.error_summary'; _os.path.exists(_es) and print(open(_es).read())"
+    stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+    cached = _manual_bp_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return list(cached[1])
+
+    with open(path) as f:
+        text = f.read()
+    # Format: filepath:line — one rpartition per line; lines without a colon
+    # or with a non-numeric line number are skipped
+    breakpoints = [(filepath, int(lineno))
+                   for filepath, sep, lineno in (line.strip().rpartition(':') for line in text.splitlines())
+                   if sep and lineno.isdecimal()]
+    _manual_bp_cache[path] = (stamp, breakpoints)
+    return list(breakpoints)
+
+
+# Code that prints the error summary file if it exists
+_ERROR_SUMMARY_SNIPPET = ("import os as _os; _es='_pretty_testing_/.error_summary'; "
+                          "_os.path.exists(_es) and print(open(_es).read())")
+_PUDB_PREAMBLE = 'import pudb; _dbg = pudb._get_debugger()'
+_PDBPP_PREAMBLE = ("import pdb; hasattr(pdb,'DefaultConfig') and "
+                   "setattr(pdb.DefaultConfig,'sticky_by_default',True); _dbg = pdb.Pdb()")
+# Injection strings for the common case of no breakpoints at all
+_PUDB_BARE = f'{_PUDB_PREAMBLE}; {_ERROR_SUMMARY_SNIPPET}; pudb.set_trace()'
+_PDBPP_BARE = f'{_PDBPP_PREAMBLE}; {_ERROR_SUMMARY_SNIPPET}; pdb.set_trace()'
+
+
+def _trace_with_breaks(debugger, breaks):
+    """Join preamble, set_break calls and set_trace for the given debugger."""
+    if not breaks:
+        return _PDBPP_BARE if debugger == 'pdbpp' else _PUDB_BARE
+    # The same spot can come from several sources (fail line == method start,
+    # a manual breakpoint on the error line, ...); set each one once
+    breaks = list(dict.fromkeys(breaks))
+    # Escape each distinct path once; json.dumps output is a valid Python
+    # string literal even for paths with quotes or backslashes. ensure_ascii
+    # would write non-BMP characters as surrogate pairs, which Python reads
+    # back as two lone surrogates rather than the original character.
+    quoted = {bp_file: json.dumps(bp_file, ensure_ascii=False)
+              for bp_file in {bp_file for bp_file, _ in breaks}}
+    if len(breaks) == 1:
+        bp_file, bp_line = breaks[0]
+        set_breaks = f'_dbg.set_break({quoted[bp_file]}, {bp_line})'
+    else:
+        # One call site over a tuple literal; a `for` statement can't follow `;`
+        pairs = ', '.join(f'({quoted[bp_file]}, {bp_line})' for bp_file, bp_line in breaks)
+        set_breaks = f'[_dbg.set_break(*_bp) for _bp in ({pairs})]'
+    if debugger == 'pdbpp':
+        return f'{_PDBPP_PREAMBLE}; {set_breaks}; {_ERROR_SUMMARY_SNIPPET}; pdb.set_trace()'
+    return f'{_PUDB_PREAMBLE}; {set_breaks}; {_ERROR_SUMMARY_SNIPPET}; pudb.set_trace()'
 
 
 def _trace_line(debugger, abs_path=None, bp_target=None, user_error_file=None, user_error_line=None,
                 manual_breakpoints=None):
     """Return the set_trace injection string (no indent, no newline)."""
-    manual_breakpoints = manual_breakpoints or []
-    if debugger == 'pdbpp':
-        sticky = "hasattr(pdb,'DefaultConfig') and setattr(pdb.DefaultConfig,'sticky_by_default',True); "
-        parts = [f'import pdb; {sticky}_dbg = pdb.Pdb()']
-        if bp_target and abs_path:
-            parts.append(f'_dbg.set_break("{abs_path}", {bp_target})')
-        if user_error_file and user_error_line:
-            parts.append(f'_dbg.set_break("{user_error_file}", {user_error_line})')
-        # Add manual breakpoints
-        for bp_file, bp_line in manual_breakpoints:
-            parts.append(f'_dbg.set_break("{bp_file}", {bp_line})')
-        parts.append(_error_summary_print())
-        parts.append('pdb.set_trace()')
-        return '; '.join(parts)
-    else:
-        parts = ['import pudb; _dbg = pudb._get_debugger()']
-        if bp_target and abs_path:
-            parts.append(f'_dbg.set_break("{abs_path}", {bp_target})')
-        if user_error_file and user_error_line:
-            parts.append(f'_dbg.set_break("{user_error_file}", {user_error_line})')
-        # Add manual breakpoints
-        for bp_file, bp_line in manual_breakpoints:
-            parts.append(f'_dbg.set_break("{bp_file}", {bp_line})')
-        parts.append(_error_summary_print())
-        parts.append('pudb.set_trace()')
-        return '; '.join(parts)
+    breaks = []
+    if bp_target and abs_path:
+        breaks.append((abs_path, bp_target))
+    if user_error_file and user_error_line:
+        breaks.append((user_error_file, user_error_line))
+    if manual_breakpoints:
+        breaks.extend(manual_breakpoints)
+    return _trace_with_breaks(debugger, breaks)
 
 
 def _trace_line_multi(debugger, abs_path=None, bp_targets=None, user_error_file=None, user_error_line=None,
                       manual_breakpoints=None):
     """Return set_trace injection with multiple breakpoints (no indent, no newline)."""
-    bp_targets = bp_targets or []
-    manual_breakpoints = manual_breakpoints or []
-    if debugger == 'pdbpp':
-        sticky = "hasattr(pdb,'DefaultConfig') and setattr(pdb.DefaultConfig,'sticky_by_default',True); "
-        parts = [f'import pdb; {sticky}_dbg = pdb.Pdb()']
-        for bp in bp_targets:
-            if abs_path:
-                parts.append(f'_dbg.set_break("{abs_path}", {bp})')
-        if user_error_file and user_error_line:
-            parts.append(f'_dbg.set_break("{user_error_file}", {user_error_line})')
-        # Add manual breakpoints
-        for bp_file, bp_line in manual_breakpoints:
-            parts.append(f'_dbg.set_break("{bp_file}", {bp_line})')
-        parts.append(_error_summary_print())
-        parts.append('pdb.set_trace()')
-        return '; '.join(parts)
-    else:
-        parts = ['import pudb; _dbg = pudb._get_debugger()']
-        for bp in bp_targets:
-            if abs_path:
-                parts.append(f'_dbg.set_break("{abs_path}", {bp})')
-        if user_error_file and user_error_line:
-            parts.append(f'_dbg.set_break("{user_error_file}", {user_error_line})')
-        # Add manual breakpoints
-        for bp_file, bp_line in manual_breakpoints:
-            parts.append(f'_dbg.set_break("{bp_file}", {bp_line})')
-        parts.append(_error_summary_print())
-        parts.append('pudb.set_trace()')
-        return '; '.join(parts)
+    breaks = []
+    if bp_targets and abs_path:
+        breaks.extend((abs_path, bp) for bp in bp_targets)
+    if user_error_file and user_error_line:
+        breaks.append((user_error_file, user_error_line))
+    if manual_breakpoints:
+        breaks.extend(manual_breakpoints)
+    return _trace_with_breaks(debugger, breaks)
 
 
 def inject_set_trace(lines, method, fail_line=0, abs_path=None, debugger='pudb',
-                     user_error_file=None, user_error_line=None):
+                     user_error_file=None, user_error_line=None, manual_breakpoints=None):
     """Inject set_trace (and optionally set_break) at the start of the given method body.
 
+    manual_breakpoints defaults to read_manual_breakpoints().
     Returns modified lines list.
     """
-    # Count @timeout lines before fail_line that will be removed
-    removed = sum(1 for i, l in enumerate(lines[:max(0, fail_line - 1)])
-                  if re.match(r'\s*@timeout\b', l))
-    adj_fail = fail_line - removed if fail_line > 0 else 0
+    # Strip @timeout/alarms; line numbers from the original tree are mapped onto cleaned
+    cleaned, to_cleaned = _clean_lines(lines)
+    body = _method_body(_parse(''.join(lines)), to_cleaned, method)
+    return _inject_method_trace(cleaned, body, to_cleaned(fail_line), abs_path, debugger,
+                                user_error_file, user_error_line, manual_breakpoints)
 
-    cleaned = remove_timeouts(lines)
-    cleaned = neutralize_alarms(cleaned)
 
-    source = ''.join(cleaned)
-    tree = ast.parse(source)
+def _body_start(node):
+    """(lineno, indent) of a def's first body statement, straight from the AST.
 
-    # Read manual breakpoints
-    manual_bps = read_manual_breakpoints()
+    For a one-line `def f(): ...` the statement shares the def's line, so the
+    line's indent is the def's own.
+    """
+    first = node.body[0]
+    indent = first.col_offset if first.lineno != node.lineno else node.col_offset
+    return first.lineno, indent
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef) and node.name == method:
-            body_line = node.body[0].lineno - 1
-            indent = len(cleaned[body_line]) - len(cleaned[body_line].lstrip())
-            pad = ' ' * indent
-            bp_target = adj_fail + 1 if adj_fail > 0 else None
-            trace = _trace_line(debugger, abs_path, bp_target, user_error_file, user_error_line,
-                               manual_breakpoints=manual_bps)
-            cleaned.insert(body_line, pad + trace + '\n')
-            return cleaned
+
+def _method_body(tree, to_cleaned, method):
+    """(lineno, indent) of method's first body statement in the cleaned lines, or None.
+
+    lineno is 1-based. tree is the AST of the original (pre-clean) source.
+    """
+    node = _find_func(tree, method)
+    if node is None:
+        return None
+    lineno, indent = _body_start(node)
+    return to_cleaned(lineno), indent
+
+
+def _inject_method_trace(cleaned, body, adj_fail, abs_path, debugger,
+                         user_error_file, user_error_line, manual_breakpoints=None):
+    """inject_set_trace on already-cleaned lines, given _method_body's result (mutates cleaned)."""
+    manual_bps = read_manual_breakpoints() if manual_breakpoints is None else manual_breakpoints
+
+    if body is not None:
+        body_line, indent = body
+        body_line -= 1
+        pad = ' ' * indent
+        bp_target = adj_fail + 1 if adj_fail > 0 else None
+        trace = _trace_line(debugger, abs_path, bp_target, user_error_file, user_error_line,
+                           manual_breakpoints=manual_bps)
+        cleaned.insert(body_line, pad + trace + '\n')
+        return cleaned
 
     # Fallback: method not found, inject at top
     trace = _trace_line(debugger, user_error_file=user_error_file, user_error_line=user_error_line,
@@ -165,6 +273,11 @@ def patch_postmortem(lines, debugger):
     post_mortem at the correct frame.
     Uses e.__traceback__ directly (e is in scope from the except block).
     """
+    return list(_iter_patch_postmortem(lines, debugger))
+
+
+def _iter_patch_postmortem(lines, debugger):
+    """Lazy patch_postmortem: yields lines, so writelines() can stream the result."""
     pm_mod = 'pudb' if debugger == 'pudb' else 'pdb'
     # Indentation matches the runner block in test_generator.py (16 spaces)
     pad = ' ' * 16
@@ -177,83 +290,80 @@ def patch_postmortem(lines, debugger):
         f"{pad}except: pass\n"
         f"{pad}import {pm_mod}; {pm_mod}.post_mortem()\n"
     )
-    result = []
-    patched = False
-    for line in lines:
-        if not patched and line.strip() == 'raise e':
-            result.append(replacement)
-            patched = True
-        else:
-            result.append(line)
-    return result
+    it = iter(lines)
+    for line in it:
+        # The substring test runs in C without allocating; only strip() candidates
+        if 'raise e' in line and line.strip() == 'raise e':
+            yield replacement
+            # Only the first occurrence is patched; pass the rest through
+            yield from it
+            return
+        yield line
 
 
 def inject_setup_trace(lines, debugger='pudb', method=None, fail_line=0, abs_path=None,
-                       user_error_file=None, user_error_line=None):
+                       user_error_file=None, user_error_line=None, manual_breakpoints=None):
     """Inject set_trace into setUp body (or top of file if no setUp).
 
     When method/fail_line/abs_path are provided, also sets breakpoints at:
     - The first line of the target method body
     - The fail line (adjusted for the injection offset)
+
+    manual_breakpoints defaults to read_manual_breakpoints().
     """
-    source = ''.join(lines)
-    tree = ast.parse(source)
-    result = list(lines)
+    tree = _parse(''.join(lines))
+    return _inject_setup_trace(lines, tree, debugger, method, fail_line, abs_path,
+                               user_error_file, user_error_line, manual_breakpoints)
 
-    # Read manual breakpoints
-    manual_bps = read_manual_breakpoints()
 
-    # Find the target method's body start line (before any injection)
-    method_body_line = None
-    if method:
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name == method:
-                method_body_line = node.body[0].lineno
-                break
+def _inject_setup_trace(lines, tree, debugger, method, fail_line, abs_path,
+                        user_error_file, user_error_line, manual_breakpoints=None, to_cleaned=None):
+    """inject_setup_trace with an already-parsed tree.
+
+    If tree was parsed from the source before _clean_lines, pass its
+    to_cleaned so node line numbers are mapped onto lines.
+    """
+    result = list(lines)
+    manual_bps = read_manual_breakpoints() if manual_breakpoints is None else manual_breakpoints
+
+    # Locate the target method and setUp in one sweep (before any injection)
+    funcs = _find_funcs(tree, {method, 'setUp'} if method else {'setUp'})
+    method_body_line = funcs[method].body[0].lineno if method in funcs else None
+    if method_body_line and to_cleaned:
+        method_body_line = to_cleaned(method_body_line)
+
+    # Breakpoints are offset by 1 once the trace line is inserted
+    bp_targets = []
+    if method_body_line and abs_path:
+        # Breakpoint at method body start
+        bp_targets.append(method_body_line + 1)
+    if fail_line and abs_path:
+        # Breakpoint at fail line (duplicates are dropped in _trace_with_breaks)
+        bp_targets.append(fail_line + 1)
+    trace = _trace_line_multi(debugger, abs_path, bp_targets, user_error_file, user_error_line,
+                              manual_breakpoints=manual_bps)
 
     # Find setUp and inject set_trace
-    setup_found = False
-    setup_injection_line = None
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef) and node.name == 'setUp':
-            body_line = node.body[0].lineno - 1
-            setup_injection_line = body_line
-            indent = len(result[body_line]) - len(result[body_line].lstrip())
-            pad = ' ' * indent
-
-            # Calculate breakpoints (they'll be offset by 1 after injection)
-            bp_targets = []
-            if method_body_line and abs_path:
-                # Breakpoint at method body start (will be +1 after injection)
-                bp_targets.append(method_body_line + 1)
-            if fail_line and abs_path and fail_line != method_body_line:
-                # Breakpoint at fail line (also +1 after injection)
-                bp_targets.append(fail_line + 1)
-
-            trace = _trace_line_multi(debugger, abs_path, bp_targets, user_error_file, user_error_line,
-                                      manual_breakpoints=manual_bps)
-            result.insert(body_line, pad + trace + '\n')
-            setup_found = True
-            break
-
-    if not setup_found:
+    setup_node = funcs.get('setUp')
+    if setup_node is not None:
+        body_line, indent = _body_start(setup_node)
+        if to_cleaned:
+            body_line = to_cleaned(body_line)
+        body_line -= 1
+        result.insert(body_line, ' ' * indent + trace + '\n')
+    else:
         # No setUp found — inject at top
-        bp_targets = []
-        if method_body_line and abs_path:
-            bp_targets.append(method_body_line + 1)
-        if fail_line and abs_path and fail_line != method_body_line:
-            bp_targets.append(fail_line + 1)
-        trace = _trace_line_multi(debugger, abs_path, bp_targets, user_error_file, user_error_line,
-                                  manual_breakpoints=manual_bps)
         result.insert(0, trace + '\n')
 
     return result
 
 
-def run_preflight(file_path, method):
+def run_preflight(file_path, method, source=None):
     """Try importing the test file and running setUp. Returns (ok, error_msg).
 
     Finds the TestCase class that contains the target method (handles multiple classes).
+    If source is given it is executed in place of the file's contents (still
+    under file_path's name and directory), e.g. the timeout-neutralized text.
     """
     import importlib.util
     import unittest
@@ -262,18 +372,24 @@ def run_preflight(file_path, method):
     spec = importlib.util.spec_from_file_location('_preflight_mod', file_path)
     mod = importlib.util.module_from_spec(spec)
     try:
-        spec.loader.exec_module(mod)
+        if source is None:
+            spec.loader.exec_module(mod)
+        else:
+            exec(compile(source, file_path, 'exec'), mod.__dict__)
     except Exception as e:
         return False, f'Import error: {e}'
 
-    # Find the class that contains the target method
-    target_class = None
-    for name in dir(mod):
-        obj = getattr(mod, name)
-        if isinstance(obj, type) and issubclass(obj, unittest.TestCase) and obj is not unittest.TestCase:
-            if hasattr(obj, method):
-                target_class = obj
-                break
+    # Find the class that contains the target method. Iterate the module dict
+    # directly rather than dir() + getattr; taking the lowest name keeps dir()'s
+    # alphabetical pick, which is also what the generated runner uses.
+    # hasattr (not obj.__dict__) so methods inherited from a base class count.
+    # Private and imported classes are kept: the runner's getmembers sees them too.
+    target_name, target_class = None, None
+    for name, obj in vars(mod).items():
+        if not isinstance(obj, type) or (target_name is not None and name > target_name):
+            continue
+        if issubclass(obj, unittest.TestCase) and obj is not unittest.TestCase and hasattr(obj, method):
+            target_name, target_class = name, obj
 
     if target_class is None:
         return False, f'No TestCase class contains method {method}'
@@ -291,35 +407,91 @@ def run_preflight(file_path, method):
 
 def full_debug_prep(file_path, method, fail_line=0, debugger='pudb',
                     user_error_file=None, user_error_line=None):
-    """All-in-one: prep the file, preflight, fall back to setUp injection if needed.
+    """All-in-one: preflight, then prep the file, falling back to setUp injection if needed.
 
     This is the single entry point for both `w` and manual use.
     """
     with open(file_path) as f:
-        original_lines = f.readlines()
+        source = f.read()
     abs_path = os.path.abspath(file_path)
-    result = inject_set_trace(original_lines, method, fail_line, abs_path, debugger,
-                              user_error_file, user_error_line)
-    result = patch_postmortem(result, debugger)
-    with open(file_path, 'w') as f:
-        f.writelines(result)
+    tree = _parse(source, file_path)
+    cleaned, to_cleaned = _clean_lines(_split_lines(source))
+    manual_bps = read_manual_breakpoints()
 
-    ok, err = run_preflight(file_path, method)
-    if not ok:
-        # setUp or import failed — start fresh from original, inject into setUp instead
-        cleaned = remove_timeouts(original_lines)
-        cleaned = neutralize_alarms(cleaned)
+    # Preflight the cleaned text (no @timeout, alarms disarmed) before writing:
+    # the trace injection doesn't affect whether import/setUp succeed, so we
+    # can pick the injection point up front and write the file once.
+    ok, err = run_preflight(file_path, method, ''.join(cleaned))
+    if ok:
+        body = _method_body(tree, to_cleaned, method)
+        result = _inject_method_trace(cleaned, body, to_cleaned(fail_line), abs_path, debugger,
+                                      user_error_file, user_error_line, manual_bps)
+    else:
+        # setUp or import failed — inject into setUp instead
         # Pass breakpoint info so we stop at the right place after setUp
-        result = inject_setup_trace(cleaned, debugger, method=method, fail_line=fail_line,
-                                    abs_path=abs_path, user_error_file=user_error_file,
-                                    user_error_line=user_error_line)
-        result = patch_postmortem(result, debugger)
-        with open(file_path, 'w') as f:
-            f.writelines(result)
+        result = _inject_setup_trace(cleaned, tree, debugger, method, fail_line, abs_path,
+                                     user_error_file, user_error_line, manual_bps, to_cleaned)
+    with open(file_path, 'w') as f:
+        f.writelines(_iter_patch_postmortem(result, debugger))
+    if not ok:
         print(f'preflight failed ({err}), injected trace into setUp', file=sys.stderr)
 
 
-def main():
+# Subcommand -> (allowed options, required options); all take one FILE argument
+_CLI_OPTIONS = {
+    'debug': ({'--method', '--fail-line', '--debugger', '--user-error-file', '--user-error-line'},
+              {'--method'}),
+    'prep': ({'--method', '--fail-line', '--debugger'}, {'--method'}),
+    'preflight': ({'--method'}, {'--method'}),
+    'prep-setup': ({'--debugger'}, set()),
+}
+_CLI_INT_OPTIONS = {'--fail-line', '--user-error-line'}
+_DEBUGGERS = ('pudb', 'pdbpp')
+
+
+def _parse_cli(argv):
+    """Parse well-formed argv by hand, without importing argparse.
+
+    Returns the same attributes as _argparse_cli, or None for anything it
+    doesn't handle (help, errors, abbreviated options), which is then left to
+    argparse so usage and error messages stay the same.
+    """
+    if not argv or argv[0] not in _CLI_OPTIONS:
+        return None
+    allowed, required = _CLI_OPTIONS[argv[0]]
+    opts, positional = {}, []
+    rest = iter(argv[1:])
+    for arg in rest:
+        if not arg.startswith('-'):
+            positional.append(arg)
+            continue
+        key, eq, value = arg.partition('=')
+        if key not in allowed:
+            return None
+        if not eq:
+            value = next(rest, None)
+            if value is None:
+                return None
+        opts[key] = value
+    if len(positional) != 1 or not required <= opts.keys():
+        return None
+    if opts.get('--debugger', 'pudb') not in _DEBUGGERS:
+        return None
+    try:
+        for key in _CLI_INT_OPTIONS & opts.keys():
+            opts[key] = int(opts[key])
+    except ValueError:
+        return None
+    args = types.SimpleNamespace(command=argv[0], file=positional[0])
+    for key in allowed:
+        default = 0 if key in _CLI_INT_OPTIONS else ('pudb' if key == '--debugger' else None)
+        setattr(args, key[2:].replace('-', '_'), opts.get(key, default))
+    return args
+
+
+def _argparse_cli(argv):
+    """Full argparse parser: used for --help and for reporting usage errors."""
+    import argparse
     parser = argparse.ArgumentParser()
     sub = parser.add_subparsers(dest='command')
 
@@ -328,7 +500,7 @@ def main():
     p_debug.add_argument('file')
     p_debug.add_argument('--method', required=True)
     p_debug.add_argument('--fail-line', type=int, default=0)
-    p_debug.add_argument('--debugger', choices=['pudb', 'pdbpp'], default='pudb')
+    p_debug.add_argument('--debugger', choices=_DEBUGGERS, default='pudb')
     p_debug.add_argument('--user-error-file', default=None, help='File where user code error originated')
     p_debug.add_argument('--user-error-line', type=int, default=0, help='Line in user code where error originated')
 
@@ -337,7 +509,7 @@ def main():
     p_prep.add_argument('file')
     p_prep.add_argument('--method', required=True)
     p_prep.add_argument('--fail-line', type=int, default=0)
-    p_prep.add_argument('--debugger', choices=['pudb', 'pdbpp'], default='pudb')
+    p_prep.add_argument('--debugger', choices=_DEBUGGERS, default='pudb')
 
     p_pre = sub.add_parser('preflight')
     p_pre.add_argument('file')
@@ -345,9 +517,20 @@ def main():
 
     p_setup = sub.add_parser('prep-setup')
     p_setup.add_argument('file')
-    p_setup.add_argument('--debugger', choices=['pudb', 'pdbpp'], default='pudb')
+    p_setup.add_argument('--debugger', choices=_DEBUGGERS, default='pudb')
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        sys.exit(1)
+    return args
+
 
-    args = parser.parse_args()
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    # argparse (and building its parser) costs more than the rest of startup,
+    # and this runs once per debugged test; only fall back to it when needed
+    args = _parse_cli(argv) or _argparse_cli(argv)
 
     if args.command == 'debug':
         user_file = args.user_error_file if args.user_error_file else None
@@ -356,8 +539,7 @@ def main():
                         user_file, user_line)
 
     elif args.command == 'prep':
-        with open(args.file) as f:
-            lines = f.readlines()
+        lines = _read_lines(args.file)
         abs_path = os.path.abspath(args.file)
         result = inject_set_trace(lines, args.method, args.fail_line, abs_path, args.debugger)
         with open(args.file, 'w') as f:
@@ -370,16 +552,11 @@ def main():
             sys.exit(1)
 
     elif args.command == 'prep-setup':
-        with open(args.file) as f:
-            lines = f.readlines()
+        lines = _read_lines(args.file)
         result = inject_setup_trace(lines, args.debugger)
         with open(args.file, 'w') as f:
             f.writelines(result)
 
-    else:
-        parser.print_help()
-        sys.exit(1)
-
 
 if __name__ == '__main__':
     main()
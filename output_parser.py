@@ -8,45 +8,118 @@ CLI:
     python3 output_parser.py trace       # stdin: raw trace → parsed sections
     python3 output_parser.py error       # stdin: error summary → colorized
     python3 output_parser.py syntax      # stdin: syntax error → pygments colored
+    python3 output_parser.py parse-all TEST_FILE METHOD  # stdin: traceback → fail line, user error loc, relevant frames
 """
 import sys
 import re
 import os
+import io
+import functools
+import itertools
 
-try:
-    from pygments import highlight
-    from pygments.lexers import PythonLexer, PythonTracebackLexer
-    from pygments.formatters import TerminalFormatter
-    has_pygments = True
-except ImportError:
-    has_pygments = False
+
+# pygments is optional and dominates startup, so it is imported on first use;
+# the frame/fail-line commands never touch it.
+@functools.lru_cache(maxsize=None)
+def _pygments():
+    """(highlight, Python lexer, traceback lexer, terminal formatter), built once.
+
+    None if pygments isn't installed.
+    """
+    try:
+        from pygments import highlight
+        from pygments.lexers import PythonLexer, PythonTracebackLexer
+        from pygments.formatters import TerminalFormatter
+    except ImportError:
+        return None
+    return highlight, PythonLexer(), PythonTracebackLexer(), TerminalFormatter()
+
+
+def _highlight(code, traceback=False):
+    """pygments.highlight with the shared Python (or traceback) lexer and terminal formatter."""
+    highlight, py_lexer, tb_lexer, formatter = _pygments()
+    return highlight(code, tb_lexer if traceback else py_lexer, formatter)
+
+# Compiled once at import rather than looked up in re's cache per line
+_CRASH_FRAME_RE = re.compile(r'(File ")(.*?)(", line )(\d+)(, in )(.*)')
+# Fallback code coloring: strings, numbers, keywords and self in one pass
+_COLOR_RE = re.compile(
+    r'(?P<str>".*?"|\'.*?\')'
+    r'|(?P<num>\b\d+\b)'
+    r'|(?P<kw>\b(?:def|class|return|if|else|elif|while|for|in|try|except|import|from|as|pass|None|True|False)\b)'
+    r'|(?P<self>\bself\b)'
+)
+_COLOR_MAP = {
+    'str': '\033[32m%s\033[0m',
+    'num': '\033[36m%s\033[0m',
+    'kw': '\033[33m%s\033[0m',
+    'self': '\033[35m%s\033[0m',
+}
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+
+_RESET = '\033[0m'
+_BOLD = '\033[1m'
+_RED = '\033[31m'
+_GREEN = '\033[32m'
+_YELLOW = '\033[33m'
+_BLUE = '\033[34m'
+_BOLD_RED = '\033[1;31m'
+_ACTUAL_PREFIX = '  ' + _BOLD + 'Actual:   ' + _YELLOW
+_EXPECTED_PREFIX = '  ' + _BOLD + 'Expected: ' + _GREEN
+_ACTUAL_RE = re.compile(r'(\s*Actual:\s*)(.*)')
+_EXPECTED_RE = re.compile(r'(\s*Expected:\s*)(.*)')
+_ERREXC_RE = re.compile(r'(\w+(?:Error|Exception|Interrupt|Iteration|Exit)):\s*(.*)')
+# Traceback frame: File "path", line N[, in method]. The method is absent for
+# e.g. SyntaxError locations. It runs to end of line; a greedy [^\n]+ takes it
+# in one step instead of growing a lazy .+? and retrying a $ anchor.
+_FRAME_RE = re.compile(r'File "([^"]+)", line (\d+)(?:, in ([^\n]+))?')
 
 
 def colorize_crash(text):
-    """Colorize a crash traceback, showing only from the last frame."""
-    lines = text.splitlines()
-    last_frame_start = -1
-    for i, line in enumerate(lines):
-        if line.strip().startswith('File "'):
-            last_frame_start = i
-    crash_lines = lines[last_frame_start:] if last_frame_start != -1 else lines
+    """Colorize a crash traceback, showing only from the last frame.
+
+    text is a string or an iterable of lines (e.g. sys.stdin).
+    """
+    if isinstance(text, str):
+        lines = text.splitlines()
+        # The last frame is normally near the end, so scan backwards
+        crash_lines = lines
+        for i in range(len(lines) - 1, -1, -1):
+            if lines[i].lstrip().startswith('File "'):
+                crash_lines = lines[i:]
+                break
+    else:
+        # Streamed: only keep what follows the latest frame seen so far
+        crash_lines = []
+        for line in text:
+            line = line.rstrip('\n')
+            if line.lstrip().startswith('File "'):
+                crash_lines = []
+            crash_lines.append(line)
     out = []
     for line in crash_lines:
-        match = re.search(r'(File ")(.*?)(", line )(\d+)(, in )(.*)', line)
+        match = _CRASH_FRAME_RE.search(line) if 'File "' in line else None
         if match:
             prefix, path, mid1, lineno, mid2, method = match.groups()
-            out.append(f'  {prefix}\033[34m{path}\033[0m{mid1}\033[32m{lineno}\033[0m{mid2}\033[33m{method}\033[0m')
+            out.append(''.join(('  ', prefix, _BLUE, path, _RESET, mid1, _GREEN, lineno, _RESET,
+                                mid2, _YELLOW, method, _RESET)))
             continue
         if 'Error:' in line or 'Exception:' in line:
-            out.append(f'\033[31m{line}\033[0m')
+            out.append(_RED + line + _RESET)
             continue
         if '    ' in line:
-            out.append(f'\033[1m{line}\033[0m')
+            out.append(_BOLD + line + _RESET)
             continue
         out.append(line)
     return '\n'.join(out)
 
 
+def _find_funcdef(tree, name):
+    """Find a (async) def by name; the same lookup debug_prep uses."""
+    from debug_prep import _find_func
+    return _find_func(tree, name)
+
+
 def extract_source(file_path, target_name, fail_line_abs, orig_file=None):
     """Extract source code up to the failing line with syntax highlighting."""
     import ast
@@ -57,22 +130,18 @@ def extract_source(file_path, target_name, fail_line_abs, orig_file=None):
             source = f.read()
 
         tree = ast.parse(source)
-        method_node = None
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name == target_name:
-                method_node = node
-                break
+        method_node = _find_funcdef(tree, target_name)
 
         if method_node:
             rel_fail_idx = fail_line_abs - method_node.lineno
             end = fail_line_abs if fail_line_abs > 0 else method_node.end_lineno
-            lines = source.splitlines()[method_node.lineno - 1: end]
-            if lines:
-                indent_size = len(lines[0]) - len(lines[0].lstrip())
-                lines = [line[indent_size:] for line in lines]
-            code_str = '\n'.join(lines)
-            if has_pygments:
-                formatted = highlight(code_str, PythonLexer(), TerminalFormatter())
+            # Pull just the method's lines instead of splitting the whole file;
+            # StringIO's universal newlines match how ast counts line numbers.
+            indent = method_node.col_offset
+            lines = itertools.islice(io.StringIO(source, newline=None), method_node.lineno - 1, end)
+            code_str = '\n'.join(line.rstrip('\n')[indent:] for line in lines)
+            if _pygments():
+                formatted = _highlight(code_str)
             else:
                 formatted = code_str
             out_lines = formatted.splitlines()
@@ -91,35 +160,35 @@ def extract_source(file_path, target_name, fail_line_abs, orig_file=None):
 
 
 def parse_trace(text):
-    """Parse raw trace into sections. Returns (error_msg, exec_log) separated by ___SECTION_SEP___."""
+    """Parse raw trace into sections. Returns (error_msg, exec_log) separated by ___SECTION_SEP___.
+
+    text is a string or an iterable of lines (e.g. sys.stdin).
+    """
     def colorize_code(code_str):
-        if has_pygments:
+        if _pygments():
             try:
-                return highlight(code_str, PythonLexer(), TerminalFormatter()).rstrip()
+                return _highlight(code_str).rstrip()
             except Exception:
                 pass
-        code_str = re.sub(r'(".*?"|\'.*?\')', r'\033[32m\1\033[0m', code_str)
-        code_str = re.sub(r'\b(\d+)\b', r'\033[36m\1\033[0m', code_str)
-        keywords = r'\b(def|class|return|if|else|elif|while|for|in|try|except|import|from|as|pass|None|True|False)\b'
-        code_str = re.sub(keywords, r'\033[33m\1\033[0m', code_str)
-        code_str = re.sub(r'\b(self)\b', r'\033[35m\1\033[0m', code_str)
-        return code_str
+        return _COLOR_RE.sub(lambda m: _COLOR_MAP[m.lastgroup] % m.group(0), code_str)
 
     state = 0
     buf_log = []
     failure_summary = []
 
-    for line in text.splitlines(True):
-        clean = re.sub(r'\x1b\[[0-9;]*m', '', line).strip()
-        if '___TEST_START___' in clean:
-            state = 1
-            continue
-        if '___FAILURE_SUMMARY_START___' in clean:
-            state = 5
-            continue
-        if '___FAILURE_SUMMARY_END___' in clean:
-            state = 1
-            continue
+    for line in text.splitlines(True) if isinstance(text, str) else text:
+        # Most lines carry no escapes; only run the ANSI regex when one is present
+        clean = _ANSI_RE.sub('', line).strip() if '\x1b' in line else line.strip()
+        if '___' in clean:
+            if '___TEST_START___' in clean:
+                state = 1
+                continue
+            if '___FAILURE_SUMMARY_START___' in clean:
+                state = 5
+                continue
+            if '___FAILURE_SUMMARY_END___' in clean:
+                state = 1
+                continue
 
         if state == 5:
             failure_summary.append(line.rstrip())  # preserve leading whitespace (indentation)
@@ -150,35 +219,41 @@ def parse_trace(text):
 
 
 def colorize_error(text):
-    """Colorize error summary lines."""
-    out = []
-    for line in text.splitlines():
+    """Colorize error summary lines.
+
+    text is a string or an iterable of lines (e.g. sys.stdin).
+    """
+    return '\n'.join(_iter_colorize_error(text))
+
+
+def _iter_colorize_error(text):
+    """Yield colorize_error's output lines one at a time."""
+    for line in text.splitlines() if isinstance(text, str) else text:
         line = line.rstrip()
         if not line:
             continue
         if line.endswith(':') and ('Error' in line or 'Exception' in line):
-            out.append(f'  \033[1;31m{line}\033[0m')
+            yield '  ' + _BOLD_RED + line + _RESET
             continue
-        m2 = re.match(r'(\s*Actual:\s*)(.*)', line)
+        m2 = _ACTUAL_RE.match(line)
         if m2:
-            out.append(f'  \033[1mActual:   \033[33m{m2.group(2)}\033[0m')
+            yield _ACTUAL_PREFIX + m2.group(2) + _RESET
             continue
-        m3 = re.match(r'(\s*Expected:\s*)(.*)', line)
+        m3 = _EXPECTED_RE.match(line)
         if m3:
-            out.append(f'  \033[1mExpected: \033[32m{m3.group(2)}\033[0m')
+            yield _EXPECTED_PREFIX + m3.group(2) + _RESET
             continue
-        m4 = re.match(r'(\w+(?:Error|Exception|Interrupt|Iteration|Exit)):\s*(.*)', line)
+        m4 = _ERREXC_RE.match(line)
         if m4:
-            out.append(f'  \033[1;31m{m4.group(1)}:\033[0m {m4.group(2)}')
+            yield '  ' + _BOLD_RED + m4.group(1) + ':' + _RESET + ' ' + m4.group(2)
             continue
-        out.append(f'  {line}')
-    return '\n'.join(out)
+        yield '  ' + line
 
 
 def colorize_syntax(text):
     """Colorize syntax error output using pygments."""
-    if has_pygments:
-        return highlight(text, PythonTracebackLexer(), TerminalFormatter()).rstrip()
+    if _pygments():
+        return _highlight(text, traceback=True).rstrip()
     return text
 
 
@@ -193,9 +268,28 @@ def _is_stdlib_or_thirdparty(path):
     return False
 
 
+def parse_frames(text):
+    """Parse every traceback frame once, for the extract_* functions to share.
+
+    text is a string or an iterable of lines, so a traceback that has already
+    been split (e.g. for colorize_crash) or is being streamed isn't rescanned
+    as a whole; only lines containing 'File "' reach the regex.
+    Returns a list of (file_path, line_number, method_name) tuples in traceback
+    order; method_name is None for frames without an "in <method>" part.
+    """
+    if isinstance(text, str):
+        found = _FRAME_RE.findall(text)
+    else:
+        found = [m for line in text if 'File "' in line for m in _FRAME_RE.findall(line)]
+    return [(path, int(lineno), method.strip() if method else None)
+            for path, lineno, method in found]
+
+
 def extract_relevant_traceback(text, test_file):
     """Extract relevant frames from traceback: test file + user code, excluding stdlib.
 
+    text is the traceback or its parse_frames() result.
+
     Returns a list of (file_path, line_number, method_name) tuples representing
     the relevant portion of the stack trace.
 
@@ -209,16 +303,8 @@ def extract_relevant_traceback(text, test_file):
     - If user code raises: returns test frame + chain of user code frames
     - If user code calls stdlib and stdlib raises: returns test + user code, NOT stdlib
     """
-    # Parse traceback frames: File "path", line N, in method
-    frame_pattern = re.compile(
-        r'File "([^"]+)", line (\d+), in (.+?)$',
-        re.MULTILINE
-    )
-
-    all_frames = []
-    for match in frame_pattern.finditer(text):
-        file_path, lineno, method = match.groups()
-        all_frames.append((file_path, int(lineno), method.strip()))
+    # Only frames with an "in <method>" part
+    all_frames = [f for f in (parse_frames(text) if isinstance(text, str) else text) if f[2] is not None]
 
     if not all_frames:
         return []
@@ -264,22 +350,22 @@ def extract_relevant_traceback(text, test_file):
 def extract_user_error_location(text, test_file):
     """Extract file:line from traceback for the deepest frame NOT in test_file or stdlib.
 
+    text is the traceback or its parse_frames() result.
     Returns (file_path, line_number) or (None, None) if not found.
     """
-    # Parse traceback frames: File "path", line N
-    frame_pattern = re.compile(r'File "([^"]+)", line (\d+)')
-    frames = frame_pattern.findall(text)
+    frames = parse_frames(text) if isinstance(text, str) else text
 
     # Filter to user code: not test file, not stdlib, not site-packages
+    test_basename = os.path.basename(test_file) if test_file else None
     user_frames = []
-    for path, lineno in frames:
-        if test_file and os.path.basename(path) == os.path.basename(test_file):
+    for path, lineno, _ in frames:
+        if test_basename and os.path.basename(path) == test_basename:
             continue
         if '/lib/python' in path or 'site-packages' in path:
             continue
         if path.startswith('<'):  # <string>, <frozen>, etc.
             continue
-        user_frames.append((path, int(lineno)))
+        user_frames.append((path, lineno))
 
     # Return the deepest (last) user frame
     if user_frames:
@@ -291,33 +377,23 @@ def extract_fail_line(text, target_file, method):
     """Extract the line number from a traceback for a specific file and method.
 
     Args:
-        text: Traceback text to parse
+        text: Traceback text to parse, or its parse_frames() result
         target_file: File path to match (matches basename)
         method: Method name to match in the "in <method>" part
 
     Returns:
         Line number as int, or 0 if not found
     """
-    # Pattern: File "...", line N, in method_name
-    # Use a pattern that handles:
+    # _FRAME_RE handles:
     # - Paths with various characters (but not unescaped quotes)
     # - Method names that may contain brackets like test_foo[param]
-    frame_pattern = re.compile(
-        r'File "([^"]+)", line (\d+), in (.+?)$',
-        re.MULTILINE
-    )
-
     target_basename = os.path.basename(target_file)
     matches = []
 
-    for match in frame_pattern.finditer(text):
-        file_path, lineno, frame_method = match.groups()
-        frame_method = frame_method.strip()
-        file_basename = os.path.basename(file_path)
-
+    for file_path, lineno, frame_method in parse_frames(text) if isinstance(text, str) else text:
         # Match by basename to handle different path representations
-        if file_basename == target_basename and frame_method == method:
-            matches.append(int(lineno))
+        if frame_method == method and os.path.basename(file_path) == target_basename:
+            matches.append(lineno)
 
     # Return the last match (deepest frame in that file/method)
     if matches:
@@ -327,19 +403,35 @@ def extract_fail_line(text, target_file, method):
 
 def main():
     if len(sys.argv) < 2:
-        print('Usage: output_parser.py {crash|source|trace|error|syntax|extract-fail-line|user-error-loc|relevant-tb}', file=sys.stderr)
+        print('Usage: output_parser.py {crash|source|trace|error|syntax|extract-fail-line|user-error-loc|relevant-tb|parse-all}', file=sys.stderr)
         sys.exit(1)
 
     cmd = sys.argv[1]
 
     if cmd == 'crash':
-        print(colorize_crash(sys.stdin.read()))
+        print(colorize_crash(sys.stdin))
     elif cmd == 'relevant-tb':
         # Usage: output_parser.py relevant-tb TEST_FILE < traceback
         test_file = sys.argv[2] if len(sys.argv) > 2 else None
         frames = extract_relevant_traceback(sys.stdin.read(), test_file)
         for path, lineno, method in frames:
             print(f'File "{path}", line {lineno}, in {method}')
+    elif cmd == 'parse-all':
+        # Usage: output_parser.py parse-all TEST_FILE METHOD < traceback
+        # extract-fail-line, user-error-loc and relevant-tb from one parse,
+        # one per section, sections separated by ___SECTION_SEP___ lines
+        if len(sys.argv) < 4:
+            print('Usage: output_parser.py parse-all TEST_FILE METHOD', file=sys.stderr)
+            sys.exit(1)
+        test_file, method = sys.argv[2], sys.argv[3]
+        frames = parse_frames(sys.stdin)
+        print(extract_fail_line(frames, test_file, method))
+        print('___SECTION_SEP___')
+        path, line = extract_user_error_location(frames, test_file)
+        print(f'{path}:{line}' if path and line else '')
+        print('___SECTION_SEP___')
+        for path, lineno, frame_method in extract_relevant_traceback(frames, test_file):
+            print(f'File "{path}", line {lineno}, in {frame_method}')
     elif cmd == 'extract-fail-line':
         # Usage: output_parser.py extract-fail-line TARGET_FILE METHOD < traceback
         if len(sys.argv) < 4:
@@ -363,9 +455,14 @@ def main():
             sys.exit(1)
         print(extract_source(sys.argv[2], sys.argv[3], int(sys.argv[4])))
     elif cmd == 'trace':
-        print(parse_trace(sys.stdin.read()), end='')
+        print(parse_trace(sys.stdin), end='')
     elif cmd == 'error':
-        print(colorize_error(sys.stdin.read()))
+        # Write each line as soon as it's colored; same output as print(colorize_error(...))
+        sep = ''
+        for line in _iter_colorize_error(sys.stdin):
+            sys.stdout.write(sep + line)
+            sep = '\n'
+        sys.stdout.write('\n')
     elif cmd == 'syntax':
         print(colorize_syntax(sys.stdin.read()), end='')
     else:
@@ -5,6 +5,7 @@ These functions use an accumulator to build results during recursion,
 but make common mistakes: forgetting to pass it, resetting it each call,
 or using the wrong initial value.
 """
+import timeit
 
 
 def factorial_acc(n, acc):
@@ -149,6 +150,33 @@ def join_strings_acc(strings, separator, acc=None):
 #     return join_strings_acc(strings[1:], separator, acc + separator + strings[0])
 
 
+# Iterative reference versions: one pass, no slicing, no recursion limit.
+# The recursive versions above copy lst[1:] / s[1:] on every call (O(n^2))
+# and hit RecursionError past ~1000 elements.
+
+def sum_list_fast(lst):
+    total = 0
+    for x in lst:
+        total += x
+    return total
+
+
+def reverse_string_fast(s):
+    return s[::-1]
+
+
+def count_evens_fast(lst):
+    return sum(1 for x in lst if x % 2 == 0)
+
+
+def collect_positives_fast(lst):
+    return [x for x in lst if x > 0]
+
+
+def join_strings_fast(strings, separator):
+    return separator.join(strings)
+
+
 if __name__ == "__main__":
     print("Testing factorial_acc(5, 1)...")
     print("Expected: 120")
@@ -182,3 +210,18 @@ if __name__ == "__main__":
     print("\nTesting join_strings_acc(['a', 'b', 'c'], '-')...")
     print("Expected: 'a-b-c'")
     print(f"Got: '{join_strings_acc(['a', 'b', 'c'], '-')}'")
+
+    print("\nTiming recursive versions against the iterative references (n=500)...")
+    nums = list(range(-250, 250))
+    text = "x" * 500
+    words = ["w"] * 500
+    for name, slow, fast in [
+        ("sum_list", lambda: sum_list_acc(nums), lambda: sum_list_fast(nums)),
+        ("reverse_string", lambda: reverse_string_acc(text), lambda: reverse_string_fast(text)),
+        ("count_evens", lambda: count_evens_acc(nums), lambda: count_evens_fast(nums)),
+        ("collect_positives", lambda: collect_positives_acc(nums, []), lambda: collect_positives_fast(nums)),
+        ("join_strings", lambda: join_strings_acc(words, "-"), lambda: join_strings_fast(words, "-")),
+    ]:
+        t_slow = timeit.timeit(slow, number=100)
+        t_fast = timeit.timeit(fast, number=100)
+        print(f"{name}: recursive {t_slow * 1000:.1f} ms, iterative {t_fast * 1000:.1f} ms")
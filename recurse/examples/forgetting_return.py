@@ -5,6 +5,9 @@ These functions make recursive calls but forget to return the result.
 The recursion happens correctly, but the result is lost and None
 is returned instead.
 """
+from collections import namedtuple
+
+Node = namedtuple('Node', ['value', 'left', 'right'])
 
 
 def factorial(n):
@@ -109,8 +112,8 @@ def tree_height(node):
     if node is None:
         return 0
 
-    left_height = tree_height(node.get('left'))
-    right_height = tree_height(node.get('right'))
+    left_height = tree_height(node.left)
+    right_height = tree_height(node.right)
 
     1 + max(left_height, right_height)  # Missing return!
 
@@ -119,8 +122,8 @@ def tree_height(node):
 # def tree_height(node):
 #     if node is None:
 #         return 0
-#     left_height = tree_height(node.get('left'))
-#     right_height = tree_height(node.get('right'))
+#     left_height = tree_height(node.left)
+#     right_height = tree_height(node.right)
 #     return 1 + max(left_height, right_height)
 
 
@@ -154,15 +157,15 @@ if __name__ == "__main__":
         print(f"TypeError: {e}")
 
     print("\nTesting tree_height on a tree of height 3...")
-    tree = {
-        'value': 1,
-        'left': {
-            'value': 2,
-            'left': {'value': 4, 'left': None, 'right': None},
-            'right': None
-        },
-        'right': {'value': 3, 'left': None, 'right': None}
-    }
+    tree = Node(
+        value=1,
+        left=Node(
+            value=2,
+            left=Node(value=4, left=None, right=None),
+            right=None
+        ),
+        right=Node(value=3, left=None, right=None)
+    )
     print("Expected: 3")
     try:
         print(f"Got: {tree_height(tree)}")
@@ -5,6 +5,9 @@ These functions make multiple recursive calls (common in trees and
 divide-and-conquer) but have bugs in how the calls are made or
 which branches are processed.
 """
+from collections import namedtuple
+
+Node = namedtuple('Node', ['value', 'left', 'right'])
 
 
 def tree_contains(node, target):
@@ -17,22 +20,32 @@ def tree_contains(node, target):
     if node is None:
         return False
 
-    if node['value'] == target:
+    if node.value == target:
         return True
 
     # Wrong: only returns left result, ignores right
-    return tree_contains(node.get('left'), target)
+    return tree_contains(node.left, target)
 
 
 # Corrected version:
 # def tree_contains(node, target):
 #     if node is None:
 #         return False
-#     if node['value'] == target:
+#     if node.value == target:
 #         return True
-#     if target < node['value']:
-#         return tree_contains(node.get('left'), target)
-#     return tree_contains(node.get('right'), target)
+#     if target < node.value:
+#         return tree_contains(node.left, target)
+#     return tree_contains(node.right, target)
+
+
+def tree_contains_fast(node, target):
+    """Reference: the corrected search is tail-recursive, so it is a loop down one branch."""
+    while node is not None:
+        value = node.value
+        if value == target:
+            return True
+        node = node.left if target < value else node.right
+    return False
 
 
 def max_path_sum(node):
@@ -44,25 +57,25 @@ def max_path_sum(node):
     if node is None:
         return 0
 
-    if node.get('left') is None and node.get('right') is None:
-        return node['value']
+    value, left, right = node
+    if left is None and right is None:
+        return value
 
-    left_sum = max_path_sum(node.get('left'))
-    right_sum = max_path_sum(node.get('right'))
+    left_sum = max_path_sum(left)
+    right_sum = max_path_sum(right)
 
     # Wrong: should be max(left_sum, right_sum)
-    return node['value'] + left_sum + right_sum
+    return value + left_sum + right_sum
 
 
 # Corrected version:
 # def max_path_sum(node):
 #     if node is None:
 #         return 0
-#     if node.get('left') is None and node.get('right') is None:
-#         return node['value']
-#     left_sum = max_path_sum(node.get('left'))
-#     right_sum = max_path_sum(node.get('right'))
-#     return node['value'] + max(left_sum, right_sum)
+#     value, left, right = node
+#     if left is None and right is None:
+#         return value
+#     return value + max(max_path_sum(left), max_path_sum(right))
 
 
 def quicksort(arr):
@@ -83,14 +96,20 @@ def quicksort(arr):
     return quicksort(left) + quicksort(right)
 
 
-# Corrected version:
+# Corrected version (one partition pass instead of three; a middle pivot
+# avoids the worst case on already-sorted input):
 # def quicksort(arr):
 #     if len(arr) <= 1:
 #         return arr
-#     pivot = arr[0]
-#     left = [x for x in arr[1:] if x < pivot]
-#     middle = [x for x in arr if x == pivot]
-#     right = [x for x in arr[1:] if x > pivot]
+#     pivot = arr[len(arr) // 2]
+#     left, middle, right = [], [], []
+#     for x in arr:
+#         if x < pivot:
+#             left.append(x)
+#         elif x > pivot:
+#             right.append(x)
+#         else:
+#             middle.append(x)
 #     return quicksort(left) + middle + quicksort(right)
 
 
@@ -103,7 +122,7 @@ def tree_depth(node):
     if node is None:
         return 0
 
-    left_depth = tree_depth(node.get('left'))
+    left_depth = tree_depth(node.left)
     # Wrong: forgot to check right
 
     return 1 + left_depth
@@ -113,17 +132,19 @@ def tree_depth(node):
 # def tree_depth(node):
 #     if node is None:
 #         return 0
-#     left_depth = tree_depth(node.get('left'))
-#     right_depth = tree_depth(node.get('right'))
+#     left_depth = tree_depth(node.left)
+#     right_depth = tree_depth(node.right)
 #     return 1 + max(left_depth, right_depth)
 
 
-def fibonacci_memo(n, memo={}):
+def fibonacci_memo(n, memo=None):
     """Fibonacci with memoization but wrong recursive formula.
 
     Bug: Uses n-1 twice instead of n-1 and n-2.
     Result: Returns wrong Fibonacci numbers
     """
+    if memo is None:
+        memo = {}
     if n in memo:
         return memo[n]
 
@@ -195,15 +216,15 @@ if __name__ == "__main__":
     #     3   7
     #    / \
     #   1   4
-    bst = {
-        'value': 5,
-        'left': {
-            'value': 3,
-            'left': {'value': 1, 'left': None, 'right': None},
-            'right': {'value': 4, 'left': None, 'right': None}
-        },
-        'right': {'value': 7, 'left': None, 'right': None}
-    }
+    bst = Node(
+        value=5,
+        left=Node(
+            value=3,
+            left=Node(value=1, left=None, right=None),
+            right=Node(value=4, left=None, right=None)
+        ),
+        right=Node(value=7, left=None, right=None)
+    )
 
     print("Testing tree_contains(bst, 7)...")
     print("Expected: True")
@@ -217,11 +238,11 @@ if __name__ == "__main__":
     #       1
     #      / \
     #     2   3
-    tree = {
-        'value': 1,
-        'left': {'value': 2, 'left': None, 'right': None},
-        'right': {'value': 3, 'left': None, 'right': None}
-    }
+    tree = Node(
+        value=1,
+        left=Node(value=2, left=None, right=None),
+        right=Node(value=3, left=None, right=None)
+    )
     print("Tree: 1 -> 2, 3")
     print("Expected max path sum: 4 (1 -> 3)")
     print(f"Got: {max_path_sum(tree)}")
@@ -242,26 +263,25 @@ if __name__ == "__main__":
     #       4
     #        \
     #         5
-    unbalanced = {
-        'value': 1,
-        'left': {'value': 2, 'left': None, 'right': None},
-        'right': {
-            'value': 3,
-            'left': None,
-            'right': {
-                'value': 4,
-                'left': None,
-                'right': {'value': 5, 'left': None, 'right': None}
-            }
-        }
-    }
+    unbalanced = Node(
+        value=1,
+        left=Node(value=2, left=None, right=None),
+        right=Node(
+            value=3,
+            left=None,
+            right=Node(
+                value=4,
+                left=None,
+                right=Node(value=5, left=None, right=None)
+            )
+        )
+    )
     print("Expected depth: 4")
     print(f"Got: {tree_depth(unbalanced)}")
 
     print("\nTesting fibonacci_memo for n=0 to 8...")
     print("Expected: 0, 1, 1, 2, 3, 5, 8, 13, 21")
-    # Clear memo between tests
-    print("Got:     ", ", ".join(str(fibonacci_memo(i, {})) for i in range(9)))
+    print("Got:     ", ", ".join(str(fibonacci_memo(i)) for i in range(9)))
 
     print("\nTesting count_paths on 3x3 grid...")
     grid = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
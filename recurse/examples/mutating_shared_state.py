@@ -50,6 +50,26 @@ def find_all_paths(graph, start, end, path=[]):
 #     return paths
 
 
+def find_all_paths_fast(graph, start, end):
+    """Reference: iterative DFS where each stack entry owns its path.
+
+    Paths are immutable tuples, so no branch can see another's changes, and
+    a frozenset beside each makes the "already on this path" test O(1).
+    """
+    paths = []
+    stack = [(start, (start,), frozenset((start,)))]
+    while stack:
+        node, path, seen = stack.pop()
+        if node == end:
+            paths.append(list(path))
+            continue
+        # Reversed so neighbors come off the stack in graph order
+        for nxt in reversed(graph.get(node, ())):
+            if nxt not in seen:
+                stack.append((nxt, path + (nxt,), seen | {nxt}))
+    return paths
+
+
 def generate_subsets(nums, index=0, current=[]):
     """Generate all subsets but mutates the current list.
 
@@ -116,6 +136,19 @@ def flatten_nested(nested, result=[]):
 #     return result
 
 
+def _flat(nested):
+    for item in nested:
+        if type(item) is list:
+            yield from _flat(item)
+        else:
+            yield item
+
+
+def flatten_nested_fast(nested):
+    """Reference: a generator yields leaves directly, so there is no result list to share."""
+    return list(_flat(nested))
+
+
 if __name__ == "__main__":
     print("Testing find_all_paths...")
     graph = {
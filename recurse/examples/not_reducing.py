@@ -45,6 +45,15 @@ def reverse_string(s):
 #     if len(s) <= 1:
 #         return s
 #     return s[-1] + reverse_string(s[:-1])
+#
+# That still recurses once per character and copies an ever longer string at
+# each level (quadratic). Splitting in halves also reduces toward the base
+# case, with log(n) depth:
+# def reverse_string(s):
+#     if len(s) <= 1:
+#         return s
+#     mid = len(s) // 2
+#     return reverse_string(s[mid:]) + reverse_string(s[:mid])
 
 
 def gcd(a, b):
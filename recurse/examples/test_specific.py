@@ -45,6 +45,21 @@ tree = make_tree()
 result = tree_sum(tree)
 print(f"Result: {result} (expected: 60)")
 
+# Iterative counterparts (untraced): an explicit list as the stack, so there
+# is no frame per node and no recursion limit on deep trees.
+def tree_sum_iterative(node):
+    total = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            total += node.value
+            stack.append(node.left)
+            stack.append(node.right)
+    return total
+
+print(f"Iterative: {tree_sum_iterative(tree)}")
+
 # ============================================================
 # PATTERN 2: NamedTuple Tree - Find/Search
 # ============================================================
@@ -70,6 +85,16 @@ print(f"Find 7: {result} (expected: True)")
 result = tree_find(tree, 99)
 print(f"Find 99: {result} (expected: False)")
 
+def tree_find_iterative(node, target):
+    # tree_find is tail-recursive, so it is just a loop down one branch
+    while node is not None:
+        if node.value == target:
+            return True
+        node = node.left if target < node.value else node.right
+    return False
+
+print(f"Iterative: find 7 -> {tree_find_iterative(tree, 7)}, find 99 -> {tree_find_iterative(tree, 99)}")
+
 # ============================================================
 # PATTERN 3: NamedTuple Tree - Collect to list
 # ============================================================
@@ -79,15 +104,39 @@ print("PATTERN 3: NamedTuple Tree - Inorder traversal to list")
 print("=" * 60)
 
 @traceit_
-def inorder(node):
-    """Return inorder traversal as a list."""
-    if node is None:
-        return []
-    return inorder(node.left) + [node.value] + inorder(node.right)
+def inorder(node, out=None):
+    """Return inorder traversal as a list.
+
+    Appends into one shared list rather than building left + [value] + right
+    at every node, which copies both sides each time (quadratic overall).
+    """
+    if out is None:
+        out = []
+    if node is not None:
+        inorder(node.left, out)
+        out.append(node.value)
+        inorder(node.right, out)
+    return out
 
 result = inorder(tree)
 print(f"Inorder: {result}")
 
+def inorder_iterative(node):
+    out = []
+    stack = []
+    while stack or node is not None:
+        if node is not None:
+            # Walk left first, remembering the way back up
+            stack.append(node)
+            node = node.left
+        else:
+            node = stack.pop()
+            out.append(node.value)
+            node = node.right
+    return out
+
+print(f"Iterative: {inorder_iterative(tree)}")
+
 # ============================================================
 # PATTERN 4: Class with recursive method
 # ============================================================
@@ -105,15 +154,24 @@ class TokenProcessor:
     @traceit_
     def process(self, idx=0, acc=0):
         """Recursively process tokens, accumulating a score."""
-        if idx >= len(self.tokens):
+        tokens = self.tokens
+        if idx >= len(tokens):
             return acc
         # Simple scoring: add token value
-        score = self.tokens[idx] * (idx + 1)
+        score = tokens[idx] * (idx + 1)
         return self.process(idx + 1, acc + score)
 
+    def process_iterative(self):
+        """Same score as a loop over a local, with no frame or self.tokens lookup per token."""
+        acc = 0
+        for position, token in enumerate(self.tokens, start=1):
+            acc += token * position
+        return acc
+
 processor = TokenProcessor([1, 2, 3, 4, 5])
 result = processor.process()
 print(f"Result: {result} (expected: 1*1 + 2*2 + 3*3 + 4*4 + 5*5 = 55)")
+print(f"Iterative: {processor.process_iterative()}")
 
 # ============================================================
 # PATTERN 5: Recursive array splitting (divide & conquer)
@@ -215,15 +273,22 @@ print("\n" + "=" * 60)
 print("PATTERN 9: Recursive sequence generation")
 print("=" * 60)
 
-@traceit_
 def generate_sequence(n, seq=None):
-    """Generate sequence where each element is sum of previous two."""
-    if seq is None:
-        seq = [0, 1]
+    """Generate sequence where each element is sum of previous two.
+
+    Copies the caller's seq once, then grows that copy in place; passing
+    seq + [next_val] at each step would copy the whole sequence every time.
+    """
+    seq = [0, 1] if seq is None else list(seq)
+    return extend_sequence(n, seq)
+
+@traceit_
+def extend_sequence(n, seq):
+    """Append sums of the previous two to seq until it has n elements."""
     if len(seq) >= n:
         return seq[:n]
-    next_val = seq[-1] + seq[-2]
-    return generate_sequence(n, seq + [next_val])
+    seq.append(seq[-1] + seq[-2])
+    return extend_sequence(n, seq)
 
 result = generate_sequence(8)
 print(f"Sequence: {result}")
@@ -245,3 +310,16 @@ def tree_depth(node):
 
 result = tree_depth(tree)
 print(f"Depth: {result} (expected: 3)")
+
+def tree_depth_iterative(node):
+    depth = 0
+    stack = [(node, 1)]
+    while stack:
+        node, level = stack.pop()
+        if node is not None:
+            depth = max(depth, level)
+            stack.append((node.left, level + 1))
+            stack.append((node.right, level + 1))
+    return depth
+
+print(f"Iterative: {tree_depth_iterative(tree)}")
@@ -95,9 +95,10 @@ class TokenProcessorBuggy:
     @traceit_
     def process(self, idx=0, acc=0):
         """Bug: Doesn't pass updated accumulator."""
-        if idx >= len(self.tokens):
+        tokens = self.tokens
+        if idx >= len(tokens):
             return acc
-        score = self.tokens[idx] * (idx + 1)
+        score = tokens[idx] * (idx + 1)
         # BUG: Should pass acc + score, not just score
         return self.process(idx + 1, score)
 
@@ -73,6 +73,20 @@ def tree_sum(node):
 #     return node['value'] + left_sum + right_sum
 
 
+def tree_sum_fast(node):
+    """Reference: corrected sum with an explicit stack instead of recursion."""
+    total = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        total += node['value']
+        stack.append(node.get('left'))
+        stack.append(node.get('right'))
+    return total
+
+
 def count_nodes(node):
     """Count nodes in a tree but wrong combination.
 
@@ -98,6 +112,20 @@ def count_nodes(node):
 #     return 1 + left_count + right_count
 
 
+def count_nodes_fast(node):
+    """Reference: corrected count with an explicit stack, like tree_sum_fast."""
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if node is None:
+            continue
+        count += 1
+        stack.append(node.get('left'))
+        stack.append(node.get('right'))
+    return count
+
+
 def list_product(lst):
     """Multiply all elements but uses wrong operator.
 
@@ -138,11 +166,12 @@ def collect_leaves(node):
     if node is None:
         return []
 
-    if node.get('left') is None and node.get('right') is None:
+    left, right = node.get('left'), node.get('right')
+    if left is None and right is None:
         return [node['value']]
 
-    left_leaves = collect_leaves(node.get('left'))
-    right_leaves = collect_leaves(node.get('right'))
+    left_leaves = collect_leaves(left)
+    right_leaves = collect_leaves(right)
 
     # Wrong: should return left_leaves + right_leaves
     return left_leaves.append(right_leaves)  # append returns None!
@@ -152,11 +181,10 @@ def collect_leaves(node):
 # def collect_leaves(node):
 #     if node is None:
 #         return []
-#     if node.get('left') is None and node.get('right') is None:
+#     left, right = node.get('left'), node.get('right')
+#     if left is None and right is None:
 #         return [node['value']]
-#     left_leaves = collect_leaves(node.get('left'))
-#     right_leaves = collect_leaves(node.get('right'))
-#     return left_leaves + right_leaves
+#     return collect_leaves(left) + collect_leaves(right)
 
 
 if __name__ == "__main__":
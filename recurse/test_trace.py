@@ -1,5 +1,6 @@
 """Test trace decorator against various recursive patterns."""
 
+import functools
 import sys
 sys.setrecursionlimit(30)
 
@@ -104,3 +105,17 @@ def fib(n):
     return fib(n-1) + fib(n-2)
 
 fib(5)
+
+# Test 6: Memoized Fibonacci (cache outside the trace)
+print("\n" + "=" * 60)
+print("TEST 6: Memoized Fibonacci (each n traced once)")
+print("=" * 60)
+
+@functools.lru_cache(maxsize=None)
+@traceit_
+def fib_memo(n):
+    if n <= 1:
+        return n
+    return fib_memo(n-1) + fib_memo(n-2)
+
+fib_memo(5)
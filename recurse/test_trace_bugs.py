@@ -103,10 +103,11 @@ print("=" * 60)
 def max_path_sum_wrong(node):
     if node is None:
         return 0
-    if node.get('left') is None and node.get('right') is None:
+    left_node, right_node = node.get('left'), node.get('right')
+    if left_node is None and right_node is None:
         return node['value']
-    left = max_path_sum_wrong(node.get('left'))
-    right = max_path_sum_wrong(node.get('right'))
+    left = max_path_sum_wrong(left_node)
+    right = max_path_sum_wrong(right_node)
     return node['value'] + left + right  # BUG: should use max(left, right)
 
 tree = {
@@ -4,6 +4,10 @@ List Comprehension Pitfalls
 These errors are NOT caught by static analyzers because they are logic errors.
 """
 
+from itertools import chain
+
+import numpy as np
+
 # =============================================================================
 # 1. Wrong Filter Logic
 # =============================================================================
@@ -50,11 +54,15 @@ print(f"GOOD (x ** 2): {square_values_good(items)}")  # [1, 4, 9, 16]
 
 def flatten_matrix_bad(matrix):
     """BAD: Inner x shadows outer x - confusing and error-prone"""
-    return [[x for x in row] for x in matrix]  # Both use 'x'!
+    return [x for x in matrix for x in x]  # Both use 'x'!
 
 def flatten_matrix_good(matrix):
     """GOOD: Use distinct variable names"""
-    return [[cell for cell in row] for row in matrix]
+    return [cell for row in matrix for cell in row]
+
+def flatten_matrix_fast(matrix):
+    """FAST: chain.from_iterable runs the inner loop in C"""
+    return list(chain.from_iterable(matrix))
 
 # Demo
 print("\n=== Variable Shadowing ===")
@@ -62,6 +70,7 @@ matrix = [[1, 2], [3, 4], [5, 6]]
 print(f"Matrix: {matrix}")
 print(f"BAD (shadowed x):  {flatten_matrix_bad(matrix)}")
 print(f"GOOD (distinct names): {flatten_matrix_good(matrix)}")
+print(f"FAST (chain):          {flatten_matrix_fast(matrix)}")
 # Both produce same output here, but the BAD version is confusing
 # The real danger: outer 'x' is not accessible in outer scope after comprehension
 
@@ -161,6 +170,29 @@ result_good, count = count_and_transform_good(items)
 print(f"GOOD: result={result_good}, count={count}")
 
 
+# =============================================================================
+# 7. Comprehensions Over NumPy Arrays
+# =============================================================================
+
+def filter_and_square_bad(arr):
+    """BAD: Python loop over an ndarray - every element is boxed into a scalar"""
+    return np.array([x ** 2 for x in arr if x >= 0 and x % 2 != 0])
+
+def filter_and_square_good(arr):
+    """GOOD: Boolean mask selects in one C pass, then square the whole array"""
+    kept = arr[(arr >= 0) & (arr % 2 != 0)]
+    return kept ** 2
+
+# Demo
+print("\n=== NumPy Arrays ===")
+arr = np.arange(-3, 8)
+print(f"Array: {arr}")
+print(f"BAD (comprehension): {filter_and_square_bad(arr)}")  # [ 1  9 25 49]
+print(f"GOOD (mask):         {filter_and_square_good(arr)}")  # [ 1  9 25 49]
+# Same result; for large arrays the mask version is orders of magnitude faster.
+# On plain Python lists a comprehension is fine - no need to convert just for this.
+
+
 # =============================================================================
 # Summary
 # =============================================================================
@@ -173,3 +205,4 @@ print("3. Use distinct variable names in nested comprehensions")
 print("4. Handle empty results explicitly")
 print("5. Don't forget to use/return the comprehension result")
 print("6. Avoid side effects in comprehensions")
+print("7. On NumPy arrays, use masks and array ops instead of comprehensions")
@@ -222,6 +222,18 @@ def tree_sum_good(node):
         return 0
     return node['value'] + tree_sum_good(node.get('left')) + tree_sum_good(node.get('right'))
 
+def tree_sum_fast(root):
+    """FAST: Explicit stack instead of one frame per node (no depth limit)"""
+    total = 0
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            total += node['value']
+            stack.append(node.get('left'))
+            stack.append(node.get('right'))
+    return total
+
 # Demo
 print("\n=== Tree Recursion ===")
 tree = {
@@ -232,6 +244,7 @@ tree = {
 print(f"Tree: root=1, left=2, right=3")
 print(f"tree_sum_bad (left twice): {tree_sum_bad(tree)}")   # 5 (1+2+2, missed right!)
 print(f"tree_sum_good: {tree_sum_good(tree)}")              # 6 (1+2+3)
+print(f"tree_sum_fast: {tree_sum_fast(tree)}")              # 6, iterative
 
 
 # =============================================================================
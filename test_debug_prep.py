@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Tests for debug_prep.py"""
+import ast
 import os
 import sys
 import textwrap
@@ -9,10 +10,13 @@ import unittest
 from debug_prep import (
     remove_timeouts,
     neutralize_alarms,
+    _clean_lines,
+    _read_lines,
     inject_set_trace,
     inject_setup_trace,
     patch_postmortem,
     run_preflight,
+    full_debug_prep,
     read_manual_breakpoints,
     MANUAL_BP_FILE,
 )
@@ -35,6 +39,10 @@ class TestRemoveTimeouts(unittest.TestCase):
         result = remove_timeouts(lines)
         self.assertEqual(result, ['    def test_foo(self):\n'])
 
+    def test_similar_names_kept(self):
+        lines = ['    @timeouts(5)\n', '    @timeout_ms(5)\n', '    x = "@timeout"\n']
+        self.assertEqual(remove_timeouts(lines), lines)
+
     def test_multiple_decorators(self):
         lines = [
             '    @mock.patch("foo")\n',
@@ -62,6 +70,41 @@ class TestNeutralizeAlarms(unittest.TestCase):
         self.assertEqual(result, ['    signal.alarm(0)))\n'])
 
 
+class TestCleanLines(unittest.TestCase):
+
+    def test_matches_separate_passes(self):
+        lines = [
+            '    @timeout(5)\n',
+            '    def test_foo(self):\n',
+            '        signal.alarm(30)\n',
+            '    @timeout\n',
+            '    def test_bar(self):\n',
+        ]
+        cleaned, _ = _clean_lines(lines)
+        self.assertEqual(cleaned, neutralize_alarms(remove_timeouts(lines)))
+
+    def test_maps_original_line_numbers(self):
+        lines = ['@timeout(1)\n', 'def a(): pass\n', '@timeout(1)\n', 'def b(): pass\n']
+        cleaned, to_cleaned = _clean_lines(lines)
+        self.assertEqual(to_cleaned(0), 0)
+        self.assertEqual(cleaned[to_cleaned(2) - 1], 'def a(): pass\n')
+        self.assertEqual(cleaned[to_cleaned(4) - 1], 'def b(): pass\n')
+
+
+class TestReadLines(unittest.TestCase):
+
+    def test_matches_readlines(self):
+        for text in ['', 'a', 'a\n', 'a\n\nb', 'x\x0cy\n']:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+                f.write(text)
+            try:
+                with open(f.name) as fh:
+                    expected = fh.readlines()
+                self.assertEqual(_read_lines(f.name), expected, repr(text))
+            finally:
+                os.unlink(f.name)
+
+
 class TestInjectSetTrace(unittest.TestCase):
 
     def _make_lines(self, code):
@@ -82,6 +125,56 @@ class TestInjectSetTrace(unittest.TestCase):
         x_idx = next(i for i, l in enumerate(result) if 'x = 1' in l)
         self.assertLess(trace_idx, x_idx)
 
+    def test_def_inside_string_literal_is_ignored(self):
+        lines = self._make_lines("""\
+            FIXTURE = \"\"\"
+                def test_a(self):
+                    assert False
+            \"\"\"
+            class TestFoo:
+                async def test_a(self):
+                    y = 2
+        """)
+        result = inject_set_trace(lines, 'test_a')
+        trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+        self.assertEqual(result[trace_idx + 1].strip(), 'y = 2')
+        ast.parse(''.join(result))
+
+    def test_method_in_second_class(self):
+        lines = self._make_lines("""\
+            class TestA:
+                def test_foo(self):
+                    pass
+            class TestB:
+                def test_bar(self):
+                    y = 2
+        """)
+        result = inject_set_trace(lines, 'test_bar')
+        trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+        self.assertEqual(result[trace_idx + 1].strip(), 'y = 2')
+
+    def test_indent_from_ast_for_multiline_signature(self):
+        lines = self._make_lines("""\
+            class TestFoo:
+                def test_bar(self,
+                             arg=1):
+                    x = 1
+        """)
+        result = inject_set_trace(lines, 'test_bar')
+        trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+        self.assertTrue(result[trace_idx].startswith(' ' * 8 + 'import'))
+        ast.parse(''.join(result))
+
+    def test_one_line_method_keeps_def_indent(self):
+        lines = self._make_lines("""\
+            class TestFoo:
+                def test_bar(self): x = 1
+        """)
+        result = inject_set_trace(lines, 'test_bar')
+        trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+        self.assertTrue(result[trace_idx].startswith(' ' * 4 + 'import'))
+        ast.parse(''.join(result))
+
     def test_method_not_found_fallback(self):
         lines = self._make_lines("""\
             class TestFoo:
@@ -104,6 +197,52 @@ class TestInjectSetTrace(unittest.TestCase):
         self.assertIn('set_break', joined)
         self.assertIn('/tmp/test.py', joined)
 
+    def test_timeout_lines_shift_injection_and_break(self):
+        lines = self._make_lines("""\
+            class TestFoo:
+                @timeout(1)
+                def test_a(self):
+                    pass
+                @timeout(1)
+                def test_bar(self):
+                    x = 1
+                    assert x == 2
+        """)
+        result = inject_set_trace(lines, 'test_bar', fail_line=8, abs_path='/tmp/test.py')
+        trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+        self.assertEqual(result[trace_idx + 1].strip(), 'x = 1')
+        # fail line 8 loses two @timeout lines, then shifts by one for the injection
+        self.assertIn('set_break("/tmp/test.py", 7)', result[trace_idx])
+        self.assertEqual(result[7 - 1].strip(), 'assert x == 2')
+
+    def test_set_break_path_is_escaped(self):
+        lines = self._make_lines("""\
+            class TestFoo:
+                def test_bar(self):
+                    x = 1
+        """)
+        path = 'C:\\tests\\it\'s "here".py'
+        result = inject_set_trace(lines, 'test_bar', fail_line=3, abs_path=path)
+        trace_line = next(l for l in result if 'set_trace' in l).strip()
+        call = next(n for n in ast.walk(ast.parse(trace_line))
+                    if isinstance(n, ast.Call) and getattr(n.func, 'attr', '') == 'set_break')
+        self.assertEqual(call.args[0].value, path)
+
+    def test_set_break_non_ascii_path(self):
+        lines = self._make_lines("""\
+            class TestFoo:
+                def test_bar(self):
+                    x = 1
+        """)
+        path = '/home/u/\U0001f4c1proj/t\u00e9st.py'
+        result = inject_set_trace(lines, 'test_bar', fail_line=3, abs_path=path)
+        trace_line = next(l for l in result if 'set_trace' in l).strip()
+        # Written literally, not as a surrogate pair that evaluates to another string
+        self.assertIn(path, trace_line)
+        call = next(n for n in ast.walk(ast.parse(trace_line))
+                    if isinstance(n, ast.Call) and getattr(n.func, 'attr', '') == 'set_break')
+        self.assertEqual(call.args[0].value, path)
+
     def test_pdbpp_injection(self):
         lines = self._make_lines("""\
             class TestFoo:
@@ -160,6 +299,32 @@ class TestInjectSetupTrace(unittest.TestCase):
         result = inject_setup_trace(lines)
         self.assertIn('set_trace', result[0])
 
+    def test_setup_in_class_under_if(self):
+        lines = self._make_lines("""\
+            import sys
+            if sys.version_info >= (3,):
+                class TestFoo:
+                    def setUp(self):
+                        self.x = 1
+        """)
+        result = inject_setup_trace(lines)
+        trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+        self.assertEqual(result[trace_idx + 1].strip(), 'self.x = 1')
+
+    def test_breakpoint_on_async_method_in_nested_class(self):
+        lines = self._make_lines("""\
+            class Outer:
+                class TestFoo:
+                    def setUp(self):
+                        self.x = 1
+                    async def test_bar(self):
+                        y = 2
+        """)
+        result = inject_setup_trace(lines, method='test_bar', abs_path='/tmp/t.py',
+                                    manual_breakpoints=[])
+        # Body line 6 moves to 7 once the trace is inserted
+        self.assertIn('"/tmp/t.py", 7)', ''.join(result))
+
     def test_setup_injection_with_breakpoints(self):
         """When injecting into setUp, should also set breakpoints at fail line and method start."""
         lines = self._make_lines("""\
@@ -182,6 +347,32 @@ class TestInjectSetupTrace(unittest.TestCase):
         # Should have set_break for the fail line (adjusted for injection)
         self.assertIn('set_break', joined)
         self.assertIn('/tmp/test.py', joined)
+        # Method body start (5) and fail line (6), both shifted by the injection
+        trace_line = next(l for l in result if 'set_trace' in l)
+        self.assertIn('("/tmp/test.py", 6), ("/tmp/test.py", 7)', trace_line)
+        ast.parse(trace_line.strip())
+
+    def test_setup_injection_dedupes_breakpoints(self):
+        """Fail line on the first body line and a matching user error line set one break."""
+        lines = self._make_lines("""\
+            class TestFoo:
+                def setUp(self):
+                    self.x = 1
+                def test_bar(self):
+                    assert False
+        """)
+        result = inject_setup_trace(
+            lines,
+            method='test_bar',
+            fail_line=5,
+            abs_path='/tmp/test.py',
+            user_error_file='/tmp/test.py',
+            user_error_line=6,
+            manual_breakpoints=[('/tmp/test.py', 6), ('/tmp/other.py', 3)],
+        )
+        trace_line = next(l for l in result if 'set_trace' in l)
+        self.assertEqual(trace_line.count('"/tmp/test.py", 6'), 1)
+        self.assertIn('"/tmp/other.py", 3', trace_line)
 
     def test_setup_injection_sets_method_start_breakpoint(self):
         """When injecting into setUp, should set breakpoint at start of target method body."""
@@ -287,6 +478,48 @@ class TestPreflight(unittest.TestCase):
         finally:
             os.unlink(path)
 
+    def test_preflight_finds_inherited_method(self):
+        """A test method defined on a mixin base is found on the TestCase subclass."""
+        path = self._write_temp("""\
+            import unittest
+            class Mixin:
+                def test_a(self):
+                    pass
+            class TestSub(Mixin, unittest.TestCase):
+                def setUp(self):
+                    raise RuntimeError("sub setUp")
+        """)
+        try:
+            ok, err = run_preflight(path, 'test_a')
+            self.assertFalse(ok)
+            self.assertIn('sub setUp', err)
+        finally:
+            os.unlink(path)
+
+    def test_preflight_finds_private_and_imported_classes(self):
+        """Classes the runner would discover are not filtered out by name or __module__."""
+        path = self._write_temp("""\
+            import unittest
+            class _TestPrivate(unittest.TestCase):
+                def setUp(self):
+                    raise RuntimeError("private setUp")
+                def test_a(self):
+                    pass
+            def _setup(self):
+                raise RuntimeError("imported setUp")
+            TestImported = type('TestImported', (unittest.TestCase,), {
+                '__module__': 'elsewhere', 'setUp': _setup, 'test_b': lambda self: None})
+        """)
+        try:
+            ok, err = run_preflight(path, 'test_a')
+            self.assertFalse(ok)
+            self.assertIn('private setUp', err)
+            ok, err = run_preflight(path, 'test_b')
+            self.assertFalse(ok)
+            self.assertIn('imported setUp', err)
+        finally:
+            os.unlink(path)
+
     def test_preflight_success(self):
         path = self._write_temp("""\
             import unittest
@@ -333,6 +566,151 @@ class TestPreflight(unittest.TestCase):
             os.unlink(path)
 
 
+class TestFullDebugPrep(unittest.TestCase):
+
+    def _write_temp(self, code):
+        f = tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False)
+        f.write(textwrap.dedent(code))
+        f.close()
+        return f.name
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.readlines()
+
+    def test_injects_into_method_when_preflight_passes(self):
+        path = self._write_temp("""\
+            import unittest
+            def timeout(seconds):
+                return lambda f: f
+            class TestOk(unittest.TestCase):
+                @timeout(2)
+                def test_a(self):
+                    x = 1
+        """)
+        try:
+            full_debug_prep(path, 'test_a')
+            result = self._read(path)
+            self.assertFalse(any('@timeout' in l for l in result))
+            trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+            self.assertEqual(result[trace_idx + 1].strip(), 'x = 1')
+        finally:
+            os.unlink(path)
+
+    def test_falls_back_to_setup_when_preflight_fails(self):
+        path = self._write_temp("""\
+            import unittest
+            def timeout(seconds):
+                return lambda f: f
+            class TestBad(unittest.TestCase):
+                def setUp(self):
+                    raise RuntimeError("boom")
+                @timeout(2)
+                def test_a(self):
+                    signal.alarm(5)
+        """)
+        try:
+            full_debug_prep(path, 'test_a')
+            result = self._read(path)
+            self.assertEqual(sum('set_trace' in l for l in result), 1)
+            trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+            self.assertIn('raise RuntimeError', result[trace_idx + 1])
+            self.assertFalse(any('@timeout' in l for l in result))
+            self.assertTrue(any('signal.alarm(0)' in l for l in result))
+        finally:
+            os.unlink(path)
+
+    def test_preflight_runs_with_alarms_neutralized(self):
+        """An alarm armed at import or in setUp must not fire during preflight."""
+        path = self._write_temp("""\
+            import signal
+            import unittest
+            signal.alarm(1)
+            class TestOk(unittest.TestCase):
+                def setUp(self):
+                    signal.alarm(1)
+                def test_a(self):
+                    x = 1
+        """)
+        import signal
+        from unittest import mock
+        try:
+            with mock.patch('signal.alarm') as alarm:
+                full_debug_prep(path, 'test_a')
+            self.assertTrue(all(c.args == (0,) for c in alarm.call_args_list))
+            result = self._read(path)
+            trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+            self.assertEqual(result[trace_idx + 1].strip(), 'x = 1')
+        finally:
+            signal.alarm(0)
+            os.unlink(path)
+
+    def test_import_error_without_setup_falls_back(self):
+        """No setUp doesn't mean preflight can be skipped: the import can still fail."""
+        path = self._write_temp("""\
+            import nonexistent_module_xyz
+            import unittest
+            class TestBad(unittest.TestCase):
+                def test_a(self):
+                    x = 1
+        """)
+        try:
+            full_debug_prep(path, 'test_a')
+            result = self._read(path)
+            trace_idx = next(i for i, l in enumerate(result) if 'set_trace' in l)
+            import_idx = next(i for i, l in enumerate(result) if 'nonexistent_module_xyz' in l)
+            self.assertLess(trace_idx, import_idx)
+        finally:
+            os.unlink(path)
+
+    def test_file_read_once_and_written_once(self):
+        """Even on the setUp fallback the test file is opened once to read, once to write."""
+        import builtins
+        from unittest import mock
+        path = self._write_temp("""\
+            import unittest
+            class TestBad(unittest.TestCase):
+                def setUp(self):
+                    raise RuntimeError("boom")
+                def test_a(self):
+                    x = 1
+        """)
+        try:
+            with mock.patch('builtins.open', wraps=builtins.open) as m_open:
+                full_debug_prep(path, 'test_a')
+            modes = [c.args[1] if len(c.args) > 1 else c.kwargs.get('mode', 'r')
+                     for c in m_open.call_args_list if c.args and c.args[0] == path]
+            self.assertEqual(modes, ['r', 'w'])
+        finally:
+            os.unlink(path)
+
+
+class TestCliParsing(unittest.TestCase):
+    """The hand-rolled argv parser agrees with argparse, and defers to it otherwise."""
+
+    def test_matches_argparse(self):
+        from debug_prep import _parse_cli, _argparse_cli
+        for argv in (
+            ['debug', 'f.py', '--method', 'test_a'],
+            ['debug', 'f.py', '--method=test_a', '--fail-line', '12', '--debugger', 'pdbpp',
+             '--user-error-file', 'mod.py', '--user-error-line=7'],
+            ['prep', '--method', 'test_a', 'f.py', '--fail-line', '-1'],
+            ['preflight', 'f.py', '--method', 'test_a'],
+            ['prep-setup', 'f.py'],
+        ):
+            with self.subTest(argv=argv):
+                self.assertEqual(vars(_parse_cli(argv)), vars(_argparse_cli(argv)))
+
+    def test_defers_to_argparse(self):
+        from debug_prep import _parse_cli
+        for argv in ([], ['--help'], ['debug', '--help'], ['debug', 'f.py'],
+                     ['prep', 'f.py', '--meth', 'x'], ['prep', 'f.py', '--method', 'x', '--fail-line', 'x'],
+                     ['prep-setup', 'f.py', '--debugger', 'gdb'], ['preflight', 'a.py', 'b.py', '--method', 'x'],
+                     ['debug', 'f.py', '--method']):
+            with self.subTest(argv=argv):
+                self.assertIsNone(_parse_cli(argv))
+
+
 class TestSyntaxCheckPerFile(unittest.TestCase):
     """Verify that py_compile catches errors in each file independently."""
 
@@ -422,6 +800,61 @@ AssertionError: 1 != 2
         self.assertIsNone(path)
 
 
+class TestParseFrames(unittest.TestCase):
+    """Test output_parser.parse_frames and reuse of its result by the extract_* functions."""
+
+    TRACEBACK = """\
+Traceback (most recent call last):
+  File "_pretty_testing_/debug_this_test.py", line 90, in <module>
+    main()
+  File "_pretty_testing_/debug_this_test.py", line 12, in test_foo
+    helper()
+  File "/home/user/project/mod.py", line 5, in helper
+    import broken
+  File "/home/user/project/broken.py", line 3
+    def (:
+SyntaxError: invalid syntax
+"""
+
+    def test_frames_without_method(self):
+        from output_parser import parse_frames
+        frames = parse_frames(self.TRACEBACK)
+        self.assertEqual(len(frames), 4)
+        self.assertEqual(frames[1], ("_pretty_testing_/debug_this_test.py", 12, "test_foo"))
+        self.assertEqual(frames[3], ("/home/user/project/broken.py", 3, None))
+
+    def test_extract_functions_accept_parsed_frames(self):
+        from output_parser import (parse_frames, extract_fail_line,
+                                   extract_user_error_location, extract_relevant_traceback)
+        frames = parse_frames(self.TRACEBACK)
+        for func, args in [(extract_fail_line, ("debug_this_test.py", "test_foo")),
+                           (extract_user_error_location, ("debug_this_test.py",)),
+                           (extract_relevant_traceback, ("debug_this_test.py",))]:
+            with self.subTest(func=func.__name__):
+                self.assertEqual(func(frames, *args), func(self.TRACEBACK, *args))
+        self.assertEqual(extract_fail_line(frames, "debug_this_test.py", "test_foo"), 12)
+        self.assertEqual(extract_user_error_location(frames, "debug_this_test.py"),
+                         ("/home/user/project/broken.py", 3))
+        self.assertEqual([f[2] for f in extract_relevant_traceback(frames, "debug_this_test.py")],
+                         ["test_foo", "helper"])
+
+    def test_split_lines_shared_with_colorize_crash(self):
+        from output_parser import parse_frames, colorize_crash
+        lines = self.TRACEBACK.splitlines()
+        self.assertEqual(parse_frames(lines), parse_frames(self.TRACEBACK))
+        self.assertEqual(colorize_crash(lines), colorize_crash(self.TRACEBACK))
+
+    def test_parse_all_cli(self):
+        import subprocess
+        parser = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'output_parser.py')
+        result = subprocess.run([sys.executable, parser, 'parse-all', 'debug_this_test.py', 'test_foo'],
+                                input=self.TRACEBACK, capture_output=True, text=True)
+        lines = result.stdout.splitlines()
+        self.assertEqual(lines[:4], ['12', '___SECTION_SEP___', '/home/user/project/broken.py:3',
+                                     '___SECTION_SEP___'])
+        self.assertIn('in helper', lines[-1])
+
+
 class TestExtractRelevantTraceback(unittest.TestCase):
     """Test output_parser.extract_relevant_traceback for proper stack trace display."""
 
@@ -668,6 +1101,106 @@ class TestColorizeErrorExtended(unittest.TestCase):
         self.assertIn("\033[", result)
 
 
+class TestStreamedInput(unittest.TestCase):
+    """crash/trace/error parsers give the same result for a string or a line stream."""
+
+    RAW = """\
+___TEST_START___
+[EXE] x = compute()
+some log line
+___FAILURE_SUMMARY_START___
+  AssertionError:
+    Actual: 3
+    Expected: 4
+___FAILURE_SUMMARY_END___
+Traceback (most recent call last):
+  File "/a/b.py", line 3, in foo
+    x = 1
+  File "/a/c.py", line 9, in bar
+    raise ValueError("x")
+ValueError: x
+"""
+
+    def test_stream_matches_string(self):
+        import io
+        from output_parser import colorize_crash, colorize_error, parse_trace
+        for func in (colorize_crash, colorize_error, parse_trace):
+            with self.subTest(func=func.__name__):
+                self.assertEqual(func(io.StringIO(self.RAW)), func(self.RAW))
+
+    def test_streamed_crash_keeps_only_last_frame(self):
+        import io
+        from output_parser import colorize_crash
+        result = colorize_crash(io.StringIO(self.RAW))
+        self.assertNotIn('/a/b.py', result)
+        self.assertIn('/a/c.py', result)
+
+
+class TestExtractSource(unittest.TestCase):
+    """Test output_parser.extract_source locates the named method."""
+
+    def _extract(self, src, name, fail_line=0):
+        import output_parser
+        from unittest import mock
+        with tempfile.NamedTemporaryFile('w', suffix='.py', delete=False) as f:
+            f.write(textwrap.dedent(src))
+        self.addCleanup(os.unlink, f.name)
+        with mock.patch.object(output_parser, '_pygments', lambda: None):
+            return output_parser.extract_source(f.name, name, fail_line)
+
+    def test_method_in_nested_class(self):
+        result = self._extract("""\
+            class Outer:
+                class TestInner:
+                    def test_x(self):
+                        y = 1
+        """, 'test_x')
+        self.assertIn('def test_x(self):', result)
+        self.assertIn('y = 1', result)
+
+    def test_method_in_class_under_try(self):
+        result = self._extract("""\
+            try:
+                class TestA:
+                    def test_x(self):
+                        y = 1
+            except ImportError:
+                pass
+        """, 'test_x')
+        self.assertIn('y = 1', result)
+
+    def test_blank_line_and_fail_marker(self):
+        result = self._extract("""\
+            import os
+
+            class TestA:
+                def test_a(self):
+                    x = 1
+
+                    assert x == 2
+                    y = 3
+        """, 'test_a', fail_line=7)
+        self.assertEqual(result.splitlines(), [
+            '    def test_a(self):',
+            '        x = 1',
+            '    ',
+            '\x1b[91m--> \x1b[0m    assert x == 2',
+        ])
+
+    def test_async_method(self):
+        result = self._extract("""\
+            class TestA:
+                async def test_a(self):
+                    await thing()
+        """, 'test_a', fail_line=3)
+        self.assertIn('--> ', result)
+        self.assertIn('await thing()', result)
+
+    def test_missing_method(self):
+        result = self._extract("def other():\n    pass\n", 'test_missing')
+        self.assertEqual(result, 'Method source not found.')
+
+
 class TestManualBreakpoints(unittest.TestCase):
     """Test manual breakpoint management."""
 
@@ -712,6 +1245,19 @@ class TestManualBreakpoints(unittest.TestCase):
         self.assertEqual(len(bps), 1)
         self.assertEqual(bps[0], ('/valid/file.py', 50))
 
+    def test_read_manual_breakpoints_sees_file_changes(self):
+        """Cached breakpoints are re-read once the file is modified."""
+        bp_path = os.path.join('_pretty_testing_', '.manual_breakpoints')
+        with open(bp_path, 'w') as f:
+            f.write('/a.py:1\n')
+        self.assertEqual(read_manual_breakpoints(), [('/a.py', 1)])
+        self.assertEqual(read_manual_breakpoints(), [('/a.py', 1)])
+        with open(bp_path, 'a') as f:
+            f.write('/b.py:2\n')
+        self.assertEqual(read_manual_breakpoints(), [('/a.py', 1), ('/b.py', 2)])
+        os.remove(bp_path)
+        self.assertEqual(read_manual_breakpoints(), [])
+
     def test_inject_set_trace_includes_manual_breakpoints(self):
         """Manual breakpoints are included in injected trace."""
         bp_path = os.path.join('_pretty_testing_', '.manual_breakpoints')
@@ -1080,6 +1626,35 @@ ___TEST_START___
         self.assertIn('result = calculate(5)', exec_log)
         self.assertIn('self.assertEqual(result, 10)', exec_log)
 
+    def test_fallback_coloring_without_pygments(self):
+        """Without pygments each token is colored once; string contents are left alone."""
+        from unittest import mock
+        import output_parser
+        raw_output = "___TEST_START___\n[EXE] if self.x in 'a 5': return 10\n"
+        with mock.patch.object(output_parser, '_pygments', lambda: None):
+            exec_log = output_parser.parse_trace(raw_output).split('___SECTION_SEP___')[2]
+        self.assertIn("\033[32m'a 5'\033[0m", exec_log)
+        self.assertIn('\033[36m10\033[0m', exec_log)
+        self.assertIn('\033[33mif\033[0m', exec_log)
+        self.assertIn('\033[35mself\033[0m', exec_log)
+        self.assertIn("if self.x in 'a 5': return 10", self._strip_ansi(exec_log))
+
+    def test_colored_sentinels_and_summary(self):
+        """Sentinels wrapped in ANSI codes still switch sections."""
+        from output_parser import parse_trace
+        raw_output = (
+            "\x1b[2m___TEST_START___\x1b[0m\n"
+            "[EXE] label = 'x'\n"
+            "\x1b[1m___FAILURE_SUMMARY_START___\x1b[0m\n"
+            "  \x1b[31mAssertionError\x1b[0m\n"
+            "___FAILURE_SUMMARY_END___\n"
+        )
+        parts = parse_trace(raw_output).split('___SECTION_SEP___')
+        self.assertIn('AssertionError', parts[1])
+        exec_log = self._strip_ansi(parts[2])
+        self.assertIn("label = 'x'", exec_log)
+        self.assertNotIn('AssertionError', exec_log)
+
 
 class TestUntraceScript(unittest.TestCase):
     """Test the untrace script removes @traceit_ and @trace decorators."""
@@ -1658,5 +2233,142 @@ class TestRecursionErrorHandling(unittest.TestCase):
         self.assertIn('ValueError', result.stderr)
 
 
+
+class TestTraceitWrapper(unittest.TestCase):
+    """Test traceit_ wrapper reuse and depth-prefixed output."""
+
+    def test_redecorating_gives_independent_wrappers(self):
+        from traceit_ import traceit_
+
+        def f(n):
+            return n
+        a, b = traceit_(f), traceit_(f)
+        self.assertIsNot(a, b)
+        self.assertIsNot(a._depth, b._depth)
+
+    def test_call_header_printed_when_arg_formatting_fails(self):
+        import io
+        from contextlib import redirect_stdout
+        from traceit_ import traceit_
+
+        class Boom:
+            __slots__ = ()
+
+            def __repr__(self):
+                raise RecursionError('repr failed')
+
+        @traceit_
+        def f(x, y):
+            return 0
+        buf = io.StringIO()
+        with redirect_stdout(buf), self.assertRaises(RecursionError):
+            f(1, Boom())
+        self.assertEqual(buf.getvalue().splitlines(), ['f(', '\tx = 1'])
+
+    def test_output_past_max_depth(self):
+        import io
+        from contextlib import redirect_stdout
+        from traceit_ import traceit_
+
+        def g(n):
+            return 0 if n == 0 else g(n - 1)
+        g = traceit_(max_depth=2, show_depth=True, verbose=False)(g)
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            self.assertEqual(g(5), 0)
+        self.assertEqual(buf.getvalue().splitlines(), [
+            '[0] g(5)',
+            '[1] ├──\tg(4)',
+            '[2] │\t├──\t... (max depth 2 reached)',
+            '[1] │\t└─>\t0',
+            '[0] └─>\t0',
+        ])
+
+
+def _load_example(name):
+    """Load recurse/examples/<name>.py, returning (module, corrected) where
+    corrected holds the functions from its '# Corrected version' comment blocks."""
+    import importlib.util
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'recurse', 'examples', name + '.py')
+    spec = importlib.util.spec_from_file_location('example_' + name, path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+
+    blocks, block = [], None
+    for line in _read_lines(path):
+        if line.startswith('# Corrected version'):
+            block = []
+            blocks.append(block)
+        elif block == [] and line.startswith('#') and not line.startswith('# def '):
+            continue  # rest of a header comment that wraps
+        elif block is not None and line.startswith('#'):
+            block.append(line[2:] if line.startswith('# ') else line[1:])
+        else:
+            block = None
+    corrected = dict(vars(mod))
+    for block in blocks:
+        exec(''.join(block), corrected)
+    return mod, corrected
+
+
+class TestRecurseExampleReferences(unittest.TestCase):
+    """The non-recursive references in recurse/examples agree with the corrected recursion."""
+
+    def test_accumulator_references(self):
+        mod, fixed = _load_example('accumulator_mistakes')
+        for lst in ([], [4], [3, -1, 4, -1, 5, -9, 2, 6], list(range(-20, 20))):
+            self.assertEqual(mod.sum_list_fast(lst), fixed['sum_list_acc'](lst))
+            self.assertEqual(mod.count_evens_fast(lst), fixed['count_evens_acc'](lst))
+            self.assertEqual(mod.collect_positives_fast(lst), fixed['collect_positives_acc'](lst))
+        for text in ('', 'a', 'hello'):
+            self.assertEqual(mod.reverse_string_fast(text), fixed['reverse_string_acc'](text))
+        for words in ([], ['a'], ['a', 'b', 'c']):
+            self.assertEqual(mod.join_strings_fast(words, '-'), fixed['join_strings_acc'](words, '-'))
+
+    def test_tree_walk_references(self):
+        mod, fixed = _load_example('wrong_combination')
+
+        def leaf(v):
+            return {'value': v, 'left': None, 'right': None}
+        trees = [
+            None,
+            leaf(7),
+            {'value': 1, 'left': {'value': 2, 'left': leaf(4), 'right': leaf(5)},
+             'right': {'value': 3, 'left': leaf(6), 'right': None}},
+            {'value': 1, 'left': None,
+             'right': {'value': -2, 'left': None, 'right': leaf(3)}},
+        ]
+        for tree in trees:
+            self.assertEqual(mod.tree_sum_fast(tree), fixed['tree_sum'](tree))
+            self.assertEqual(mod.count_nodes_fast(tree), fixed['count_nodes'](tree))
+
+    def test_tree_contains_reference(self):
+        mod, fixed = _load_example('multiple_recursive_calls')
+        Node = mod.Node
+        bst = Node(5, Node(3, Node(1, None, None), Node(4, None, None)), Node(7, None, None))
+        for target in range(9):
+            self.assertEqual(mod.tree_contains_fast(bst, target),
+                             fixed['tree_contains'](bst, target))
+        self.assertFalse(mod.tree_contains_fast(None, 1))
+
+    def test_find_all_paths_reference(self):
+        mod, fixed = _load_example('mutating_shared_state')
+        graphs = [
+            {'A': ['B', 'C'], 'B': ['D'], 'C': ['D'], 'D': []},
+            {'A': ['B'], 'B': ['A', 'C'], 'C': ['A']},  # cycles
+            {'A': []},
+        ]
+        for graph in graphs:
+            for end in ('A', 'C', 'D'):
+                self.assertEqual(mod.find_all_paths_fast(graph, 'A', end),
+                                 fixed['find_all_paths'](graph, 'A', end))
+
+    def test_flatten_nested_reference(self):
+        mod, fixed = _load_example('mutating_shared_state')
+        for nested in ([], [1, [2, 3]], [[[]], [1, [2, [3, [4]]]], 5]):
+            self.assertEqual(mod.flatten_nested_fast(nested), fixed['flatten_nested'](nested))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -168,12 +168,11 @@ def traceit_(_func=None, *, max_depth=6, show_returns=True, max_len=None, indent
         ret  = "└─>" + indent    # return value
         exc  = "└─✕" + indent    # exception
 
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            current_depth = depth[0]
-            d = current_depth
-            dp = f"[{d}] " if show_depth else ""
+        # Line prefixes depend only on depth; build each depth's set once
+        prefixes = {}
 
+        def _prefixes(d):
+            dp = f"[{d}] " if show_depth else ""
             # Build prefixes for call, return, and exception lines
             if d == 0:
                 call_pfx = dp
@@ -183,30 +182,48 @@ def traceit_(_func=None, *, max_depth=6, show_returns=True, max_len=None, indent
             exc_pfx = dp + pipe * d + exc
             # Continuation prefix for verbose arg lines
             cont_pfx = dp + pipe * d
+            return dp, call_pfx, ret_pfx, exc_pfx, cont_pfx
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            d = depth[0]
+            # Nothing is printed below max_depth, so skip the prefixes there
+            if d <= max_depth:
+                pfx = prefixes.get(d)
+                if pfx is None:
+                    pfx = prefixes[d] = _prefixes(d)
+                dp, call_pfx, ret_pfx, exc_pfx, cont_pfx = pfx
 
             if d < max_depth:
                 if verbose:
-                    # Print function name, then each arg on its own line
-                    print(f"{call_pfx}{func.__name__}(")
-                    # Figure out which args to skip (self detection)
-                    start_idx = 0
-                    if len(args) > 0:
-                        first = args[0]
-                        if hasattr(first, '__dict__') and not isinstance(first, type):
-                            start_idx = 1
-                    for i, a in enumerate(args):
-                        if i < start_idx:
-                            continue
-                        watch_idx = i - start_idx
-                        if watch is not None and watch_idx not in watch:
-                            continue
-                        name = param_names[i] if i < len(param_names) else f"arg{i}"
-                        val = _smart_truncate(a, max_len)
-                        print(f"{cont_pfx}{indent}{name} = {val}")
-                    for k, v in kwargs.items():
-                        val = _smart_truncate(v, max_len)
-                        print(f"{cont_pfx}{indent}{k} = {val}")
-                    print(f"{cont_pfx})")
+                    # Function name, then each arg on its own line; the block
+                    # is written with one print instead of one per line
+                    lines = [f"{call_pfx}{func.__name__}("]
+                    try:
+                        # Figure out which args to skip (self detection)
+                        start_idx = 0
+                        if len(args) > 0:
+                            first = args[0]
+                            if hasattr(first, '__dict__') and not isinstance(first, type):
+                                start_idx = 1
+                        for i, a in enumerate(args):
+                            if i < start_idx:
+                                continue
+                            watch_idx = i - start_idx
+                            if watch is not None and watch_idx not in watch:
+                                continue
+                            name = param_names[i] if i < len(param_names) else f"arg{i}"
+                            val = _smart_truncate(a, max_len)
+                            lines.append(f"{cont_pfx}{indent}{name} = {val}")
+                        for k, v in kwargs.items():
+                            val = _smart_truncate(v, max_len)
+                            lines.append(f"{cont_pfx}{indent}{k} = {val}")
+                        lines.append(f"{cont_pfx})")
+                    finally:
+                        # Flush the partial block if formatting an arg raised
+                        # (e.g. at the recursion limit): that deepest call is
+                        # the one the trace most needs to show
+                        print("\n".join(lines))
                 else:
                     args_str = _format_args(args, kwargs, max_len, watch)
                     call_str = f"{func.__name__}({args_str})"